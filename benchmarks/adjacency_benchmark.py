@@ -0,0 +1,77 @@
+import timeit
+
+from flow_game.adjacency import get_neighbors
+from flow_game.board import Board
+from problems.level_creator import create_level
+
+NUMBER_OF_CALLS = 2000
+LEVEL = 1
+
+
+def count_empty_neighbors_with_directions(board):
+    """
+    Count the empty neighbors of every cell by rebuilding the directions and
+    bounds checking every neighbor, the way the code did before the tables.
+    :param board: the board to count on
+    :return: total number of empty neighbors
+    """
+    count = 0
+    for x in range(board.board_size):
+        for y in range(board.board_size):
+            directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+            for dx, dy in directions:
+                if board.is_coord_valid(x + dx, y + dy) and \
+                        board.is_cell_empty(x + dx, y + dy):
+                    count += 1
+    return count
+
+
+def count_empty_neighbors_with_table(board):
+    """
+    Count the empty neighbors of every cell with the precomputed neighbor
+    table of the board size.
+    :param board: the board to count on
+    :return: total number of empty neighbors
+    """
+    count = 0
+    grid = board.grid
+    for cell_neighbors in get_neighbors(board.board_size):
+        for neighbor in cell_neighbors:
+            if grid[neighbor] == 0:
+                count += 1
+    return count
+
+
+def time_per_call(function, board):
+    """
+    Time a function on a board.
+    :param function: the function to time
+    :param board: the board to pass to the function
+    :return: mean time of a call in microseconds
+    """
+    total_time = timeit.timeit(lambda: function(board), number=NUMBER_OF_CALLS)
+    return total_time / NUMBER_OF_CALLS * 1e6
+
+
+def run_benchmark(grid_size):
+    """
+    Run the benchmark on the first level of the given grid size and print the
+    time of one full board neighbor scan with and without the table.
+    :param grid_size: size of the grid
+    """
+    board = Board(grid_size, create_level(grid_size, LEVEL))
+    assert count_empty_neighbors_with_directions(board) == \
+        count_empty_neighbors_with_table(board)
+    directions_time = time_per_call(count_empty_neighbors_with_directions,
+                                    board)
+    table_time = time_per_call(count_empty_neighbors_with_table, board)
+    print(f'{grid_size}x{grid_size}: directions {directions_time:.1f} us, '
+          f'table {table_time:.1f} us, '
+          f'speedup {directions_time / table_time:.1f}x')
+
+
+if __name__ == "__main__":
+    min_grid_size = 5
+    max_grid_size = 14
+    for size in range(min_grid_size, max_grid_size + 1):
+        run_benchmark(size)
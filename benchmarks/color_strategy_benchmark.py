@@ -0,0 +1,67 @@
+import random
+import time
+
+from flow_game.color_selection import COLOR_STRATEGIES, get_color_strategy
+from flow_game.flow_free_problem import FlowFreeProblem
+from problems.level_creator import create_level
+from solvers import heuristics
+from solvers.budget import Budget
+from solvers.solver import a_star_search
+
+MIN_GRID_SIZE = 5
+MAX_GRID_SIZE = 14
+NUMBER_OF_LEVELS_PER_GRID_SIZE = 10
+# seconds one strategy gets for one level
+TIME_LIMIT = 30
+
+
+def run_level(grid_size, level_number, strategy_name):
+    """
+    Solve a level with A* and a color selection strategy.
+    :param grid_size: size of the grid
+    :param level_number: number of the level
+    :param strategy_name: the name of the color selection strategy
+    :return: whether the level was solved, the number of expanded nodes and
+    the time in seconds
+    """
+    # the goal dots are chosen at random, every strategy gets the same ones
+    random.seed(level_number)
+    dots = create_level(grid_size, level_number)
+    problem = FlowFreeProblem(grid_size, dots,
+                              color_strategy=get_color_strategy(strategy_name))
+    start_time = time.perf_counter()
+    actions = a_star_search(problem, heuristics.combined_heuristic,
+                            budget=Budget(time_limit=TIME_LIMIT))
+    return (bool(actions), problem.expanded,
+            time.perf_counter() - start_time)
+
+
+def run_benchmark():
+    """
+    Solve all the levels with every color selection strategy, print the
+    expanded nodes and the time of every grid size and the totals of every
+    strategy. The levels that ran out of time count with their time limit.
+    """
+    totals = {name: [0, 0, 0.0] for name in COLOR_STRATEGIES}
+    for grid_size in range(MIN_GRID_SIZE, MAX_GRID_SIZE + 1):
+        for name in COLOR_STRATEGIES:
+            solved, expanded, total_time = 0, 0, 0.0
+            for level_number in range(1, NUMBER_OF_LEVELS_PER_GRID_SIZE + 1):
+                level_solved, level_expanded, level_time = run_level(
+                    grid_size, level_number, name)
+                solved += level_solved
+                expanded += level_expanded
+                total_time += level_time
+            print(f'{grid_size:2}x{grid_size:<2} {name:24} solved {solved:2} '
+                  f'expanded {expanded:10} time {total_time:8.2f} s',
+                  flush=True)
+            totals[name][0] += solved
+            totals[name][1] += expanded
+            totals[name][2] += total_time
+    for name, (solved, expanded, total_time) in totals.items():
+        print(f'total {name:24} solved {solved:3} expanded {expanded:10} '
+              f'time {total_time:8.2f} s')
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,76 @@
+import random
+import time
+
+from solvers.frontier import FifoFrontier, BucketPriorityQueue, \
+    prefer_deeper_nodes
+from solvers.util import Queue, PriorityQueue, SearchNode
+
+NUMBER_OF_ITEMS = 20000
+MAX_PRIORITY = 200
+SEED = 0
+
+
+def time_fifo(fringe, items):
+    """
+    Time pushing all the items into a FIFO fringe and popping them back.
+    :param fringe: the fringe to time
+    :param items: the items to push
+    :return: the time in seconds
+    """
+    start_time = time.perf_counter()
+    for item in items:
+        fringe.push(item)
+    while not fringe.is_empty():
+        fringe.pop()
+    return time.perf_counter() - start_time
+
+
+def time_priority_queue(fringe, items, priorities):
+    """
+    Time a search like pattern on a priority queue: every pop is followed by
+    two pushes, until all the items were pushed, then the queue is emptied.
+    :param fringe: the priority queue to time
+    :param items: the items to push
+    :param priorities: the priority of every item
+    :return: the time in seconds
+    """
+    start_time = time.perf_counter()
+    fringe.push(items[0], priorities[0])
+    index = 1
+    while not fringe.is_empty():
+        fringe.pop()
+        for _ in range(2):
+            if index < len(items):
+                fringe.push(items[index], priorities[index])
+                index += 1
+    return time.perf_counter() - start_time
+
+
+def run_benchmark():
+    """
+    Compare the frontier classes with the classes of solvers.util and print
+    the time per item.
+    """
+    generator = random.Random(SEED)
+    items = [SearchNode(None, cost=generator.randrange(MAX_PRIORITY)) for _
+             in range(NUMBER_OF_ITEMS)]
+    priorities = [item.cost + generator.randrange(MAX_PRIORITY) for item in
+                  items]
+    results = [
+        ('FIFO', 'util.Queue', time_fifo(Queue(), items)),
+        ('FIFO', 'FifoFrontier', time_fifo(FifoFrontier(), items)),
+        ('priority', 'util.PriorityQueue',
+         time_priority_queue(PriorityQueue(), items, priorities)),
+        ('priority', 'BucketPriorityQueue',
+         time_priority_queue(BucketPriorityQueue(), items, priorities)),
+        ('priority', 'BucketPriorityQueue(prefer_deeper_nodes)',
+         time_priority_queue(BucketPriorityQueue(prefer_deeper_nodes), items,
+                             priorities)),
+    ]
+    for kind, name, total_time in results:
+        print(f'{kind:8} {name:42} '
+              f'{total_time / NUMBER_OF_ITEMS * 1e6:8.2f} us per item')
+
+
+if __name__ == "__main__":
+    run_benchmark()
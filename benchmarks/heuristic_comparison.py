@@ -0,0 +1,104 @@
+import argparse
+import os
+import random
+import time
+
+import pandas as pd
+
+from flow_game.flow_free_problem import FlowFreeProblem
+from main import run_search_algorithm
+from problems.level_creator import create_level
+from solvers.budget import Budget
+from solvers.heuristics import HEURISTICS
+from solvers.search_stats import SearchStats
+
+GRID_SIZES = [8, 9, 10]
+LEVELS = list(range(1, 11))
+# seconds one heuristic gets for one level
+TIME_LIMIT = 60
+# compare_heuristics of results/plots.py reads the table from here
+OUTPUT_PATH = 'results/csvs/Heuristic_results.csv'
+COLUMNS = ['grid size', 'level', 'heuristic', 'solved', 'time',
+           'expended nodes', 'heuristic time', 'heuristic time share']
+
+
+def run_level(grid_size, level_number, heuristic_name, time_limit):
+    """
+    Solve a level with A* and a registered heuristic.
+    :param grid_size: size of the grid
+    :param level_number: number of the level
+    :param heuristic_name: the name of the heuristic
+    :param time_limit: the seconds the search gets
+    :return: the row of the level in the results table
+    """
+    # the goal dots are chosen at random, every heuristic gets the same ones
+    random.seed(level_number)
+    dots = create_level(grid_size, level_number)
+    problem = FlowFreeProblem(grid_size, dots, stats=SearchStats())
+    start_time = time.perf_counter()
+    actions = run_search_algorithm("A*", problem,
+                                   budget=Budget(time_limit=time_limit),
+                                   heuristic_name=heuristic_name)
+    elapsed_time = time.perf_counter() - start_time
+    heuristic_time = problem.stats.heuristic_time
+    return [grid_size, level_number, heuristic_name, bool(actions),
+            elapsed_time, problem.expanded, heuristic_time,
+            heuristic_time / elapsed_time if elapsed_time else 0.0]
+
+
+def compare_heuristics(grid_sizes=GRID_SIZES, levels=LEVELS,
+                       heuristic_names=None, time_limit=TIME_LIMIT,
+                       output_path=OUTPUT_PATH):
+    """
+    Run A* with every heuristic on every level and save one row per run.
+    :param grid_sizes: the grid sizes of the levels
+    :param levels: the level numbers of every grid size
+    :param heuristic_names: the names of the heuristics, all the registered
+    heuristics if None
+    :param time_limit: the seconds one heuristic gets for one level
+    :param output_path: the path of the results csv file
+    :return: the results table
+    """
+    if heuristic_names is None:
+        heuristic_names = list(HEURISTICS)
+    results = pd.DataFrame(columns=COLUMNS)
+    for grid_size in grid_sizes:
+        for level_number in levels:
+            for heuristic_name in heuristic_names:
+                row = run_level(grid_size, level_number, heuristic_name,
+                                time_limit)
+                results.loc[len(results)] = row
+                print(f'{grid_size}x{grid_size} level {level_number:2} '
+                      f'{heuristic_name:14} solved {row[3]!s:5} '
+                      f'expanded {row[5]:8} time {row[4]:7.2f} s '
+                      f'heuristic share {row[7]:.0%}', flush=True)
+    results = results.astype({'grid size': 'int64', 'level': 'int64',
+                              'heuristic': 'string', 'solved': 'bool',
+                              'time': 'float64', 'expended nodes': 'int64',
+                              'heuristic time': 'float64',
+                              'heuristic time share': 'float64'})
+    output_directory = os.path.dirname(output_path)
+    if output_directory:
+        os.makedirs(output_directory, exist_ok=True)
+    results.to_csv(output_path, index=False)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Compare the registered heuristics with A*.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=GRID_SIZES,
+                        help='the grid sizes of the levels')
+    parser.add_argument('--levels', type=int, nargs='+', default=LEVELS,
+                        help='the level numbers of every grid size')
+    parser.add_argument('--heuristics', nargs='+', choices=list(HEURISTICS),
+                        default=None, help='the heuristics to compare, all '
+                                           'of them by default')
+    parser.add_argument('--time-limit', type=float, default=TIME_LIMIT,
+                        help='the seconds one heuristic gets for one level')
+    parser.add_argument('--output', default=OUTPUT_PATH,
+                        help='the path of the results csv file')
+    arguments = parser.parse_args()
+    compare_heuristics(arguments.sizes, arguments.levels,
+                       arguments.heuristics, arguments.time_limit,
+                       arguments.output)
@@ -0,0 +1,84 @@
+import random
+import timeit
+
+from flow_game.board import Board
+from problems.level_creator import create_level
+from solvers import heuristics
+
+NUMBER_OF_CALLS = 200
+NUMBER_OF_BOARDS = 20
+LEVEL = 1
+SEED = 0
+
+# the loop heuristics and their faster versions
+HEURISTIC_PAIRS = [
+    ('count_empty_cells', heuristics.count_empty_cells,
+     heuristics.count_empty_cells_vectorized),
+    ('count_dead_cells', heuristics.count_dead_cells,
+     heuristics.count_dead_cells_vectorized),
+    ('count_bad_cells', heuristics.count_bad_cells,
+     heuristics.count_bad_cells_vectorized),
+    ('combined vectorized', heuristics.combined_heuristic_with_loops,
+     heuristics.combined_heuristic_vectorized),
+    ('combined incremental', heuristics.combined_heuristic_with_loops,
+     heuristics.combined_heuristic),
+]
+
+
+def get_random_boards(board, number_of_boards, generator):
+    """
+    Make random legal moves from a board and keep the boards along the way,
+    so the heuristics are timed and checked on partly filled boards too.
+    :param board: the starting board
+    :param number_of_boards: the number of boards to return
+    :param generator: the random generator of the moves
+    :return: list of the boards
+    """
+    boards = [board]
+    while len(boards) < number_of_boards:
+        legal_moves = board.get_legal_moves()
+        if not legal_moves:
+            board = boards[0]
+            continue
+        board = board.do_move(generator.choice(legal_moves))
+        boards.append(board)
+    return boards
+
+
+def time_per_call(function, boards):
+    """
+    Time a function on boards.
+    :param function: the function to time
+    :param boards: the boards to pass to the function
+    :return: mean time of a call in microseconds
+    """
+    total_time = timeit.timeit(lambda: [function(board) for board in boards],
+                               number=NUMBER_OF_CALLS)
+    return total_time / (NUMBER_OF_CALLS * len(boards)) * 1e6
+
+
+def run_benchmark(grid_size):
+    """
+    Run the benchmark on random boards of the first level of the given grid
+    size, check that the loop heuristics and their faster versions agree and
+    print the time of a call of each.
+    :param grid_size: size of the grid
+    """
+    random.seed(LEVEL)
+    board = Board(grid_size, create_level(grid_size, LEVEL))
+    boards = get_random_boards(board, NUMBER_OF_BOARDS, random.Random(SEED))
+    for name, loop_heuristic, fast_heuristic in HEURISTIC_PAIRS:
+        assert all(loop_heuristic(board) == fast_heuristic(board) for
+                   board in boards), name
+        loop_time = time_per_call(loop_heuristic, boards)
+        fast_time = time_per_call(fast_heuristic, boards)
+        print(f'{grid_size}x{grid_size} {name:20}: loops {loop_time:7.1f} us, '
+              f'fast {fast_time:7.1f} us, '
+              f'speedup {loop_time / fast_time:.1f}x')
+
+
+if __name__ == "__main__":
+    min_grid_size = 5
+    max_grid_size = 14
+    for size in range(min_grid_size, max_grid_size + 1):
+        run_benchmark(size)
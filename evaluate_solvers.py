@@ -2,8 +2,9 @@ from flow_game.flow_free_problem import FlowFreeProblem
 from main import run_search_algorithm
 from main import convert_dots_to_sat_problem
 from solvers.SAT import FlowFreeSAT
+from solvers.budget import Budget, PartialResult
+from solvers.search_stats import SearchStats
 from problems.level_creator import create_level
-import signal
 import pandas as pd
 import time
 
@@ -13,46 +14,7 @@ NUMBER_OF_LEVELS_PER_GRID_SIZE = 10
 TIMEOUT = 180
 
 sat_results = pd.DataFrame(columns=['grid size','level', 'time'])
-search_results = pd.DataFrame(columns=['grid size', 'level', 'time', 'expended nodes', 'algorithm'])
-
-class TimeoutException(Exception):
-    """
-    Class for a timeout exception.
-    """
-    pass
-
-def timeout_handler(signum, frame):
-    """
-    Handle a timeout signal.
-    :param signum: signal number
-    :param frame: frame
-    :return: None
-    """
-    raise TimeoutException()
-
-
-# Set up the timeout handler
-signal.signal(signal.SIGALRM, timeout_handler)
-
-
-def run_with_timeout(timeout, function, *args, **kwargs):
-    """
-    Run a function with a timeout.
-    :param timeout: timeout in seconds
-    :param function: function to run
-    :param args: arguments
-    :param kwargs: keyword arguments
-    :return: the result of the function or None if it times out
-    """
-    signal.alarm(timeout)  # Set the timeout in seconds
-    try:
-        result = function(*args, **kwargs)
-    except TimeoutException:
-        result = None
-    finally:
-        signal.alarm(0)  # Disable the alarm
-    return result
-
+search_results = pd.DataFrame(columns=['grid size', 'level', 'time', 'expended nodes', 'algorithm'] + SearchStats.COLUMNS)
 
 def load_levels(grid_size):
     """
@@ -103,10 +65,10 @@ def evaluate_sat_solver(levels_list, grid_size):
         sat_solver = FlowFreeSAT(grid_size, colors, initial_board)
         # start timer
         start_time = time.time()
-        solution = sat_solver.solve(level)
+        solution = sat_solver.solve(level, Budget(time_limit=TIMEOUT))
         elapsed_time = time.time() - start_time
         sat_results.loc[len(sat_results)] = [grid_size, level_num + 1, elapsed_time]
-        if solution == SAT_FAILED:
+        if solution == SAT_FAILED or isinstance(solution, PartialResult):
             problems_not_passed_lst.append(level_num + 1)
             continue
         num_of_passed_problems += 1
@@ -119,15 +81,17 @@ def solve_search_problem(algo, problem_dots, grid_size):
     :param algo: algorithm to use
     :param problem_dots: list of dots representing the problem
     :param grid_size: size of the grid
-    :return: the goal state of the problem
+    :return: the goal state of the problem, the number of expanded nodes and
+    the search stats
     """
-    problem = FlowFreeProblem(grid_size, problem_dots)
-    actions = run_with_timeout(TIMEOUT, run_search_algorithm, algo, problem)
+    problem = FlowFreeProblem(grid_size, problem_dots, stats=SearchStats())
+    actions = run_search_algorithm(algo, problem,
+                                   budget=Budget(time_limit=TIMEOUT))
     problem_state = problem.get_start_state()
-    if actions is not None:
-        for action in actions:
-            problem_state = problem_state.do_move(action)
-    return problem_state, problem.expanded
+    # a search that ran out of time returns a partial result without moves
+    for action in actions:
+        problem_state = problem_state.do_move(action)
+    return problem_state, problem.expanded, problem.stats
 
 
 def evaluate_search_algorithm(levels_list, grid_size):
@@ -136,7 +100,7 @@ def evaluate_search_algorithm(levels_list, grid_size):
     :param levels_list: list of levels
     :param grid_size: size of the grid
     """
-    search_algorithms = ["BFS", "DFS", "UCS", "A*"]
+    search_algorithms = ["BFS", "DFS", "UCS", "A*", "IDA*"]
     passed_problems = {algo: 0 for algo in search_algorithms}
     global search_results
     for algo in search_algorithms:
@@ -144,13 +108,14 @@ def evaluate_search_algorithm(levels_list, grid_size):
         problems_passed_counter = 0
         for level_num, level in enumerate(levels_list):
             start_time = time.time()
-            solution, expended = solve_search_problem(algo, level, grid_size)
+            solution, expended, stats = solve_search_problem(algo, level,
+                                                             grid_size)
             elapsed_time = time.time() - start_time
             if solution.is_goal_state():
                 problems_passed_counter += 1
             else:
                 problems_not_passed_lst.append(level_num + 1)
-            search_results.loc[len(search_results)] = [grid_size, level_num + 1, elapsed_time, expended, algo]
+            search_results.loc[len(search_results)] = [grid_size, level_num + 1, elapsed_time, expended, algo] + stats.get_row()
         passed_problems[algo] = problems_passed_counter
         print_results(algo, problems_not_passed_lst,
                       problems_passed_counter, len(levels_list))
@@ -205,7 +170,16 @@ def convert_pd_types():
         {'grid size': 'int64', 'level': 'int64', 'time': 'float64'})
     search_results = search_results.astype({'grid size': 'int64', 'level': 'int64',
                                             'time': 'float32', 'expended nodes': 'int64',
-                                            'algorithm': 'string'})
+                                            'algorithm': 'string',
+                                            'successor time': 'float64',
+                                            'heuristic time': 'float64',
+                                            'hashing time': 'float64',
+                                            'peak frontier': 'int64',
+                                            'closed set size': 'int64',
+                                            'duplicates pruned': 'int64',
+                                            'branching factor': 'float64',
+                                            'heuristic cache hits': 'int64',
+                                            'heuristic cache misses': 'int64'})
 
 
 if __name__ == "__main__":
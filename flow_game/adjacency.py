@@ -0,0 +1,47 @@
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+# cache of the neighbor tables, by board size
+neighbors_cache = {}
+neighbor_coords_cache = {}
+
+
+def build_neighbor_coords(board_size):
+    """
+    Build the neighbor coordinates of every cell of a board, in the order of
+    DIRECTIONS and without the coordinates outside the board
+    :param board_size: the size of the board
+    :return: list of the neighbor coordinates, indexed by flat cell index
+    """
+    return [tuple((x + dx, y + dy) for dx, dy in DIRECTIONS if
+                  0 <= x + dx < board_size and 0 <= y + dy < board_size)
+            for x in range(board_size) for y in range(board_size)]
+
+
+def get_neighbor_coords(board_size):
+    """
+    Get the neighbor coordinates of every cell of a board, building them on
+    first use
+    :param board_size: the size of the board
+    :return: list of the neighbor (x, y) coordinates, indexed by flat cell
+    index
+    """
+    neighbor_coords = neighbor_coords_cache.get(board_size)
+    if neighbor_coords is None:
+        neighbor_coords = build_neighbor_coords(board_size)
+        neighbor_coords_cache[board_size] = neighbor_coords
+    return neighbor_coords
+
+
+def get_neighbors(board_size):
+    """
+    Get the neighbor cells of every cell of a board, building them on first
+    use
+    :param board_size: the size of the board
+    :return: list of the neighbor flat cell indices, indexed by flat cell index
+    """
+    neighbors = neighbors_cache.get(board_size)
+    if neighbors is None:
+        neighbors = [tuple(x * board_size + y for x, y in cell_coords) for
+                     cell_coords in get_neighbor_coords(board_size)]
+        neighbors_cache[board_size] = neighbors
+    return neighbors
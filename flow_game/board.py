@@ -1,6 +1,17 @@
-from flow_game.move import Move
+import time
+from collections import deque
 
-EMPTY_CELL = "black"
+from flow_game.adjacency import get_neighbors, get_neighbor_coords
+from flow_game.color_selection import get_color_strategy
+from flow_game.move import get_move_pool
+from flow_game.palette import Palette, EMPTY_COLOR_ID
+from flow_game.zobrist import get_zobrist_keys
+
+# head cell of a finished color in the byte records of the boards
+FINISHED_HEAD = 255
+# length of the current color, cost, number of empty cells and hash fields
+# at the end of a byte record
+BYTES_RECORD_TAIL_LENGTH = 13
 
 
 class Board:
@@ -8,12 +19,25 @@ class Board:
     This class represents the game board. It contains the current state of the
     game, the current color, the remaining colors, the current cost, the
     number of empty cells and the end dots.
+    The cells are kept in a flat bytearray of color ids (row major), the
+    palette maps the ids back to the color names. The zobrist hash of the
+    board is updated with every move, and so are the number of empty
+    neighbors of every cell and the components of the combined heuristic:
+    the manhattan distance of the paths, the dead cells and the bad cells.
+    The shortest paths of the colors through the empty cells are cached
+    when they are asked for, and a move drops only the paths it blocks.
+    Moves can also be made in place with apply and taken back with undo.
     """
-    def __init__(self, board_size, dots_list):
+    def __init__(self, board_size, dots_list, stats=None,
+                 color_strategy=None):
         """
         Constructor for the board
         :param board_size: the size of the board
         :param dots_list: the list of the starting dots
+        :param stats: search stats collector that times the state keys, None
+        to not collect
+        :param color_strategy: the rule that chooses the next color to play,
+        the default strategy of color_selection if None
         """
         self.board_size = board_size
         self.dots_list = dots_list
@@ -22,11 +46,28 @@ class Board:
         self.paths = self.initialize_paths()
         self.remaining_colors = list(self.paths.keys())
         self.current_color = None
-        self.game_board = self.initialize_board()
+        self.palette = Palette.from_dots(dots_list)
+        self.grid = self.initialize_board()
+        self.zobrist_keys = get_zobrist_keys(
+            board_size, self.palette.get_number_of_colors())
+        self.hash_value = self.zobrist_keys.hash_grid(self.grid)
+        self.finished_mask = 0
+        self.neighbors = get_neighbors(board_size)
+        self.neighbor_coords = get_neighbor_coords(board_size)
+        self.move_pool = get_move_pool(board_size)
+        self.free_neighbors = self.initialize_free_neighbors()
+        self.color_strategy = get_color_strategy() if color_strategy is None \
+            else color_strategy
+        self.color_index = self.color_strategy.build_index(self)
         self.choose_next_color()
         self.current_cost = 0
         self.number_empty_cells = (self.board_size ** 2 - (len(self.dots_list)
                                                            // 2))
+        (self.manhattan_distance, self.dead_cells,
+         self.bad_cells) = self.initialize_heuristic_components()
+        self.shortest_path_cache = {}
+        self.undo_stack = []
+        self.stats = stats
 
     def get_cost(self):
         """
@@ -42,32 +83,128 @@ class Board:
         """
         del self.paths[color]
         self.remaining_colors.remove(color)
+        color_id = self.palette.get_id(color)
+        self.hash_value ^= self.zobrist_keys.get_finished_key(color_id)
+        self.finished_mask |= 1 << color_id
         self.choose_next_color()
 
     def choose_next_color(self):
         """
-        Choose the next color to play
+        Choose the next color to play, with the color selection strategy of
+        the board
+        """
+        self.current_color = self.color_strategy.choose(self,
+                                                        self.color_index)
+
+    def get_manhattan_distance(self):
+        """
+        Get the sum of the manhattan distances from the flow cell of every
+        remaining color to its end dot
+        :return: the manhattan distance of the board
+        """
+        return self.manhattan_distance
+
+    def get_empty_cell_count(self):
+        """
+        Get the number of empty cells. The end dots of the remaining colors
+        are counted in number_empty_cells until they are connected, so they
+        are taken off.
+        :return: the number of empty cells of the board
+        """
+        return self.number_empty_cells - len(self.remaining_colors)
+
+    def get_dead_cell_count(self):
+        """
+        Get the number of dead cells, empty cells without empty neighbors
+        :return: the number of dead cells of the board
+        """
+        return self.dead_cells
+
+    def get_bad_cell_count(self):
+        """
+        Get the number of bad cells, colored cells with more than 2 neighbors
+        of their own color
+        :return: the number of bad cells of the board
         """
-        # first prioritize colors that the current flow cell is adjacent to a
-        # wall, then choose the color with the least possible moves
-        adjacent_to_wall = []
+        return self.bad_cells
+
+    def get_shortest_path_distance(self):
+        """
+        Get the sum of the shortest path lengths from the flow cell of every
+        remaining color to its end dot through the empty cells. The paths
+        that are not cached are found and cached in a new cache dictionary,
+        since the cache is shared with the copies of the board.
+        :return: the shortest path distance of the board, inf if a color can
+        no longer reach its end dot
+        """
+        cache = self.shortest_path_cache
+        missing_colors = [color for color in self.remaining_colors if
+                          color not in cache]
+        if missing_colors:
+            cache = dict(cache)
+            for color in missing_colors:
+                cache[color] = self.find_shortest_path(color)
+            self.shortest_path_cache = cache
+        distance = 0
         for color in self.remaining_colors:
-            x, y = self.paths[color]
-            directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-            for direction in directions:
-                dx, dy = direction
-                if not self.is_coord_valid(x + dx, y + dy):
-                    adjacent_to_wall.append(color)
-                    break
-        next_colors_lst = adjacent_to_wall if adjacent_to_wall else self.remaining_colors
-
-        next_color, min_moves = None, float('inf')
-        for color in next_colors_lst:
-            moves = self.get_number_of_moves_for_color(color)
-            if moves < min_moves:
-                min_moves = moves
-                next_color = color
-        self.current_color = next_color
+            path = cache[color]
+            if path is None:
+                return float('inf')
+            distance += len(path)
+        return distance
+
+    def find_shortest_path(self, color):
+        """
+        Find a shortest path from the flow cell of a color to its end dot
+        through the empty cells, with a breadth first search from the end dot
+        :param color: the color of the path
+        :return: tuple of the cells of the path after the flow cell, ending
+        with the end dot, or None if there is no path
+        """
+        x, y = self.paths[color]
+        head = self.get_cell_index(x, y)
+        end_dot = self.end_dots[color]
+        end = self.get_cell_index(end_dot.get_x(), end_dot.get_y())
+        grid = self.grid
+        neighbors = self.neighbors
+        # the next cell towards the end dot of every reached cell
+        next_cells = {end: None}
+        fringe = deque([end])
+        while fringe:
+            cell = fringe.popleft()
+            for neighbor in neighbors[cell]:
+                if neighbor == head:
+                    path = [cell]
+                    while next_cells[cell] is not None:
+                        cell = next_cells[cell]
+                        path.append(cell)
+                    return tuple(path)
+                if grid[neighbor] == EMPTY_COLOR_ID and \
+                        neighbor not in next_cells:
+                    next_cells[neighbor] = cell
+                    fringe.append(neighbor)
+        return None
+
+    def update_shortest_path_cache(self, color, cell, is_finishing):
+        """
+        Drop the cached shortest paths that a move blocks. Filling a cell
+        off a path can not make the path shorter or block it, so only the
+        paths through the cell are dropped. A move that follows the path of
+        its own color keeps the rest of the path, which is still shortest.
+        Paths that do not exist stay so, since cells are only filled.
+        :param color: the color of the move
+        :param cell: the flat index of the cell of the move
+        :param is_finishing: whether the move connects the color
+        """
+        new_cache = {}
+        for cached_color, path in self.shortest_path_cache.items():
+            if cached_color == color:
+                if is_finishing or (path is not None and path[0] != cell):
+                    continue
+                new_cache[color] = path if path is None else path[1:]
+            elif path is None or cell not in path:
+                new_cache[cached_color] = path
+        self.shortest_path_cache = new_cache
 
     def get_number_of_moves_for_color(self, color):
         """
@@ -75,16 +212,22 @@ class Board:
         :param color: the color to check
         :return: the number of possible moves for the color
         """
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
         x, y = self.paths[color]
-        moves = 0
-        for direction in directions:
-            dx, dy = direction
-            if self.is_coord_valid(x + dx, y + dy) and self.is_move_valid(
-                    x + dx, y + dy, color):
-                moves += 1
+        moves = self.free_neighbors[x * self.board_size + y]
+        if self.is_next_to_end_dot(color):
+            moves += 1
         return moves
 
+    def is_next_to_end_dot(self, color):
+        """
+        Check if the current flow cell of a color is next to its end dot
+        :param color: the color to check
+        :return: true if the flow cell is next to the end dot, false otherwise
+        """
+        x, y = self.paths[color]
+        end_dot = self.end_dots[color]
+        return abs(x - end_dot.get_x()) + abs(y - end_dot.get_y()) == 1
+
     def get_end_dots(self):
         """
         Get the end dots of the board
@@ -108,11 +251,128 @@ class Board:
         initialize the board with empty cells, and the start dots
         :return: the initialized board
         """
-        board = [[EMPTY_CELL for _ in range(self.board_size)] for _ in
-                 range(self.board_size)]
+        grid = bytearray(self.board_size ** 2)
         for dot in self.dots_list:
-            board[dot.get_x()][dot.get_y()] = dot.get_color()
-        return board
+            grid[self.get_cell_index(dot.get_x(), dot.get_y())] = \
+                self.palette.get_id(dot.get_color())
+        return grid
+
+    def initialize_free_neighbors(self):
+        """
+        initialize the number of empty neighbors of every cell of the board
+        :return: the number of empty neighbors of every cell
+        """
+        return bytearray(
+            sum(1 for neighbor in cell_neighbors if
+                self.grid[neighbor] == EMPTY_COLOR_ID) for cell_neighbors in
+            self.neighbors)
+
+    def initialize_heuristic_components(self):
+        """
+        Compute the components of the combined heuristic over the whole board,
+        the moves then update them from the cells around the changed cell
+        :return: the manhattan distance, the number of dead cells and the
+        number of bad cells
+        """
+        manhattan_distance = sum(
+            self.get_distance_to_end_dot(color, x, y) for color, (x, y) in
+            self.paths.items())
+        dead_cells, bad_cells = 0, 0
+        for cell, color_id in enumerate(self.grid):
+            if color_id == EMPTY_COLOR_ID:
+                dead_cells += self.free_neighbors[cell] == 0
+            else:
+                bad_cells += self.count_same_color_neighbors(cell,
+                                                             color_id) > 2
+        return manhattan_distance, dead_cells, bad_cells
+
+    def get_distance_to_end_dot(self, color, x, y):
+        """
+        Get the manhattan distance from a cell to the end dot of a color
+        :param color: the color of the end dot
+        :param x: x coordinate of the cell
+        :param y: y coordinate of the cell
+        :return: the manhattan distance
+        """
+        end_dot = self.end_dots[color]
+        return abs(x - end_dot.get_x()) + abs(y - end_dot.get_y())
+
+    def count_same_color_neighbors(self, cell, color_id):
+        """
+        Count the neighbors of a cell that have a color
+        :param cell: the flat index of the cell
+        :param color_id: the color id to look for
+        :return: the number of neighbors with the color
+        """
+        grid = self.grid
+        return sum(1 for neighbor in self.neighbors[cell] if
+                   grid[neighbor] == color_id)
+
+    def fill_cell(self, cell, color_id):
+        """
+        Color an empty cell, updating the hash, the empty neighbors and the
+        dead and bad cells. Only the neighbors of the cell and their own
+        neighbors are read.
+        :param cell: the flat index of the cell
+        :param color_id: the color id to fill the cell with
+        """
+        grid = self.grid
+        free_neighbors = self.free_neighbors
+        if free_neighbors[cell] == 0:
+            self.dead_cells -= 1
+        bad_cells = self.bad_cells
+        for neighbor in self.neighbors[cell]:
+            free_neighbors[neighbor] -= 1
+            neighbor_color_id = grid[neighbor]
+            if neighbor_color_id == EMPTY_COLOR_ID:
+                if free_neighbors[neighbor] == 0:
+                    self.dead_cells += 1
+            elif neighbor_color_id == color_id and \
+                    self.count_same_color_neighbors(neighbor, color_id) == 2:
+                # the cell becomes the third neighbor of its own color
+                bad_cells += 1
+        if self.count_same_color_neighbors(cell, color_id) > 2:
+            bad_cells += 1
+        self.bad_cells = bad_cells
+        grid[cell] = color_id
+        self.hash_value ^= self.zobrist_keys.get_cell_key(cell, color_id)
+
+    def get_cell_index(self, x, y):
+        """
+        Get the index of a cell in the flat grid
+        :param x: x coordinate
+        :param y: y coordinate
+        :return: the index of the cell
+        """
+        return x * self.board_size + y
+
+    def get_cell_color(self, x, y):
+        """
+        Get the color name of a cell
+        :param x: x coordinate
+        :param y: y coordinate
+        :return: the color name of the cell
+        """
+        return self.palette.get_name(self.grid[x * self.board_size + y])
+
+    def is_cell_empty(self, x, y):
+        """
+        Check if a cell is empty
+        :param x: x coordinate
+        :param y: y coordinate
+        :return: true if the cell is empty, false otherwise
+        """
+        return self.grid[x * self.board_size + y] == EMPTY_COLOR_ID
+
+    def get_color_board(self):
+        """
+        Get the board as a 2D list of color names, as used by the GUI
+        :return: 2D list of the color names of the cells
+        """
+        names = self.palette.names
+        return [[names[color_id] for color_id in
+                 self.grid[row:row + self.board_size]] for row in
+                range(0, self.board_size ** 2, self.board_size)]
 
     def end_point_valid_move(self, x, y, color):
         """"
@@ -122,8 +382,7 @@ class Board:
         :param color: the color of the end point
         :return: true if the move is valid for the end point, false otherwise
         """
-        return self.game_board[x][y] == EMPTY_CELL or (x, y) == self.paths[
-            color]
+        return self.is_cell_empty(x, y) or (x, y) == self.paths[color]
 
     def is_end_point_stranded(self, color):
         """
@@ -131,15 +390,10 @@ class Board:
         :param color: the color of the end point
         :return: true if the end point is stranded, false otherwise
         """
-        x, y = self.end_dots[color].get_x(), self.end_dots[color].get_y()
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        for direction in directions:
-            dx, dy = direction
-            if self.is_coord_valid(x + dx,
-                                   y + dy) and self.end_point_valid_move(
-                x + dx, y + dy, color):
-                return False
-        return True
+        end_dot = self.end_dots[color]
+        return (self.free_neighbors[self.get_cell_index(
+            end_dot.get_x(), end_dot.get_y())] == 0 and
+                not self.is_next_to_end_dot(color))
 
     def get_legal_move_for_specific_cell(self, coord):
         """
@@ -149,16 +403,13 @@ class Board:
         """
         move_list = []
         x, y = coord
-        cell_color = self.game_board[x][y]
-        if cell_color == EMPTY_CELL:
+        if self.is_cell_empty(x, y):
             return move_list
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        for direction in directions:
-            dx, dy = direction
-            if self.is_coord_valid(x + dx, y + dy) and self.is_move_valid(
-                    x + dx, y + dy, cell_color):
+        cell_color = self.get_cell_color(x, y)
+        for next_x, next_y in self.neighbor_coords[x * self.board_size + y]:
+            if self.is_move_valid(next_x, next_y, cell_color):
                 move_list.append(
-                    Move(x + dx, y + dy, cell_color))
+                    self.move_pool.get_move(next_x, next_y, cell_color))
         return move_list
 
     def check_stranded_colors(self):
@@ -167,11 +418,83 @@ class Board:
         cell)
         :return: true if there are stranded colors, false otherwise
         """
+        free_neighbors = self.free_neighbors
+        for color in self.remaining_colors:
+            if self.is_next_to_end_dot(color):
+                # the flow cell and the end dot can always move to each other
+                continue
+            x, y = self.paths[color]
+            end_dot = self.end_dots[color]
+            if free_neighbors[x * self.board_size + y] == 0 or free_neighbors[
+                    end_dot.get_x() * self.board_size + end_dot.get_y()] == 0:
+                return True
+        return False
+
+    def find_region(self, regions, cell):
+        """
+        Find the root cell of the empty region of a cell (union-find with path
+        halving)
+        :param regions: the union-find parent of every cell
+        :param cell: the cell to find the region of
+        :return: the root cell of the region
+        """
+        while regions[cell] != cell:
+            regions[cell] = regions[regions[cell]]
+            cell = regions[cell]
+        return cell
+
+    def get_empty_regions(self):
+        """
+        Group the empty cells of the board to connected regions with
+        union-find
+        :return: the union-find parent of every cell, the roots of the empty
+        cells are the regions
+        """
+        grid = self.grid
+        regions = list(range(self.board_size ** 2))
+        for cell, cell_neighbors in enumerate(self.neighbors):
+            if grid[cell] != EMPTY_COLOR_ID:
+                continue
+            for neighbor in cell_neighbors:
+                if neighbor > cell and grid[neighbor] == EMPTY_COLOR_ID:
+                    root, neighbor_root = (self.find_region(regions, cell),
+                                           self.find_region(regions, neighbor))
+                    if root != neighbor_root:
+                        regions[neighbor_root] = root
+        return regions
+
+    def get_touching_regions(self, regions, cell):
+        """
+        Get the empty regions next to a cell
+        :param regions: the union-find parent of every cell
+        :param cell: the cell to check
+        :return: set of the roots of the regions next to the cell
+        """
+        return {self.find_region(regions, neighbor) for neighbor in
+                self.neighbors[cell] if self.grid[neighbor] == EMPTY_COLOR_ID}
+
+    def has_dead_regions(self):
+        """
+        Check if the empty cells can no longer be filled: a remaining color
+        whose flow cell and end dot do not touch a common empty region (and
+        are not next to each other), or an empty region that no remaining
+        color can pass through
+        :return: true if the board can no longer be solved, false otherwise
+        """
+        regions = self.get_empty_regions()
+        usable_regions = set()
         for color in self.remaining_colors:
-            moves_for_flow = self.get_legal_move_for_specific_cell(
-                self.paths[color])
-            end_point_stranded = self.is_end_point_stranded(color)
-            if end_point_stranded or not moves_for_flow:
+            x, y = self.paths[color]
+            end_dot = self.end_dots[color]
+            common_regions = self.get_touching_regions(
+                regions, x * self.board_size + y) & self.get_touching_regions(
+                regions, end_dot.get_x() * self.board_size + end_dot.get_y())
+            if not common_regions and not self.is_next_to_end_dot(color):
+                return True
+            usable_regions |= common_regions
+        for cell in range(self.board_size ** 2):
+            if self.grid[cell] == EMPTY_COLOR_ID and \
+                    self.find_region(regions, cell) not in usable_regions:
                 return True
         return False
 
@@ -202,25 +525,159 @@ class Board:
         :param color: color of the move
         :return: true if the move is valid, false otherwise
         """
-        return self.game_board[x][y] == EMPTY_CELL or (x, y) == (
+        return self.is_cell_empty(x, y) or (x, y) == (
             self.end_dots[color].get_x(), self.end_dots[color].get_y())
 
-    def __copy__(self):
+    def copy_static_parts(self):
         """
-        Copy constructor for the board
-        :return: a copy of the board
+        Create a board that shares the parts of this board that never change
+        between states (the dots, the palette, the tables and the color
+        selection strategy with its priority index). The caller
+        sets the state parts.
+        :return: a board without its state parts
         """
         new_board = Board.__new__(Board)
         new_board.board_size = self.board_size
         new_board.dots_list = self.dots_list
         new_board.end_dots = self.end_dots
+        new_board.palette = self.palette
+        new_board.zobrist_keys = self.zobrist_keys
+        new_board.neighbors = self.neighbors
+        new_board.neighbor_coords = self.neighbor_coords
+        new_board.move_pool = self.move_pool
+        # the records do not carry the cached shortest paths
+        new_board.shortest_path_cache = {}
+        new_board.color_strategy = self.color_strategy
+        new_board.color_index = self.color_index
+        new_board.undo_stack = []
+        new_board.stats = self.stats
+        return new_board
+
+    def to_record(self):
+        """
+        Get a compact record of the state of the board, made of bytes, ints
+        and tuples only, so it is cheap to pickle and send between processes
+        :return: the record of the board state
+        """
+        return (bytes(self.grid), bytes(self.free_neighbors),
+                tuple(self.paths.items()), tuple(self.remaining_colors),
+                self.current_color, self.current_cost,
+                self.number_empty_cells, self.hash_value, self.finished_mask,
+                self.manhattan_distance, self.dead_cells, self.bad_cells)
+
+    def from_record(self, record):
+        """
+        Create a board from a record of to_record, sharing the static parts
+        of this board. The record must come from a board of the same level.
+        :param record: the record of the board state
+        :return: the board of the record
+        """
+        new_board = self.copy_static_parts()
+        (grid, free_neighbors, paths, remaining_colors,
+         new_board.current_color, new_board.current_cost,
+         new_board.number_empty_cells, new_board.hash_value,
+         new_board.finished_mask, new_board.manhattan_distance,
+         new_board.dead_cells, new_board.bad_cells) = record
+        new_board.grid = bytearray(grid)
+        new_board.free_neighbors = bytearray(free_neighbors)
+        new_board.paths = dict(paths)
+        new_board.remaining_colors = list(remaining_colors)
+        return new_board
+
+    def get_bytes_length(self):
+        """
+        Get the length of the byte records of to_bytes, the same for all the
+        boards of a level
+        :return: the length of a byte record
+        """
+        number_of_colors = self.palette.get_number_of_colors()
+        return (self.board_size ** 2 + (number_of_colors + 7) // 8 +
+                number_of_colors - 1 + BYTES_RECORD_TAIL_LENGTH)
+
+    def to_bytes(self):
+        """
+        Get a fixed length byte record of the state of the board, for
+        searches that keep their states on disk. The record starts with the
+        state key, so sorting records sorts them by state key. It is followed
+        by the head cell of every color (FINISHED_HEAD for the finished
+        colors), the current color, the cost, the number of empty cells and
+        the hash. The head cells take a byte each, which fits boards up to
+        15x15.
+        :return: the byte record of the board state
+        """
+        heads = bytearray(FINISHED_HEAD for _ in
+                          range(self.palette.get_number_of_colors() - 1))
+        for color, (x, y) in self.paths.items():
+            heads[self.palette.get_id(color) - 1] = \
+                self.get_cell_index(x, y)
+        current_color_id = EMPTY_COLOR_ID if self.current_color is None \
+            else self.palette.get_id(self.current_color)
+        return (self.get_state_key() + heads +
+                current_color_id.to_bytes(1, 'little') +
+                self.current_cost.to_bytes(2, 'little') +
+                self.number_empty_cells.to_bytes(2, 'little') +
+                self.hash_value.to_bytes(8, 'little'))
+
+    def from_bytes(self, data):
+        """
+        Create a board from a byte record of to_bytes, sharing the static
+        parts of this board. The record must come from a board of the same
+        level.
+        :param data: the byte record of the board state
+        :return: the board of the record
+        """
+        new_board = self.copy_static_parts()
+        cells = self.board_size ** 2
+        number_of_colors = self.palette.get_number_of_colors()
+        heads_start = cells + (number_of_colors + 7) // 8
+        tail_start = heads_start + number_of_colors - 1
+        new_board.grid = bytearray(data[:cells])
+        new_board.finished_mask = int.from_bytes(data[cells:heads_start],
+                                                 'little')
+        new_board.paths = {}
+        for dot in self.dots_list:
+            if not dot.get_is_goal():
+                head = data[heads_start + self.palette.get_id(
+                    dot.get_color()) - 1]
+                if head != FINISHED_HEAD:
+                    new_board.paths[dot.get_color()] = divmod(
+                        head, self.board_size)
+        new_board.remaining_colors = list(new_board.paths)
+        current_color_id = data[tail_start]
+        new_board.current_color = None if \
+            current_color_id == EMPTY_COLOR_ID else \
+            self.palette.get_name(current_color_id)
+        new_board.current_cost = int.from_bytes(
+            data[tail_start + 1:tail_start + 3], 'little')
+        new_board.number_empty_cells = int.from_bytes(
+            data[tail_start + 3:tail_start + 5], 'little')
+        new_board.hash_value = int.from_bytes(
+            data[tail_start + 5:tail_start + 13], 'little')
+        new_board.free_neighbors = new_board.initialize_free_neighbors()
+        (new_board.manhattan_distance, new_board.dead_cells,
+         new_board.bad_cells) = new_board.initialize_heuristic_components()
+        return new_board
+
+    def __copy__(self):
+        """
+        Copy constructor for the board
+        :return: a copy of the board
+        """
+        new_board = self.copy_static_parts()
         new_board.paths = {color: (x, y) for color, (x, y) in
                            self.paths.items()}
         new_board.remaining_colors = [color for color in self.remaining_colors]
-        new_board.game_board = [row[:] for row in self.game_board]
+        new_board.grid = bytearray(self.grid)
+        new_board.hash_value = self.hash_value
+        new_board.finished_mask = self.finished_mask
+        new_board.free_neighbors = bytearray(self.free_neighbors)
         new_board.current_color = self.current_color
         new_board.current_cost = self.current_cost
         new_board.number_empty_cells = self.number_empty_cells
+        new_board.manhattan_distance = self.manhattan_distance
+        new_board.dead_cells = self.dead_cells
+        new_board.bad_cells = self.bad_cells
+        new_board.shortest_path_cache = self.shortest_path_cache
         return new_board
 
     def finished_move(self, move, end_dot):
@@ -239,30 +696,101 @@ class Board:
         :param move: the move to check
         :return: true if the move is a forced move, false otherwise
         """
-        return (len(self.get_legal_moves()) == 1 and self.get_legal_moves()[
-            0] == move)
+        legal_moves = self.get_legal_moves()
+        return len(legal_moves) == 1 and legal_moves[0] == move
 
-    def do_move(self, move):
+    def do_move(self, move, is_forced=None):
         """
         make a move on the board, return a new board with the updated state
         after the move
         :param move: the move to make
+        :param is_forced: whether the move is the only legal move, checked on
+        the board when not given
         :return: a new board with the updated state after the move
         """
+        if is_forced is None:
+            is_forced = self.is_forced_move(move)
         new_board = self.__copy__()
-        new_board.game_board[move.get_x()][move.get_y()] = move.get_color()
-        new_board.number_empty_cells -= 1
-        end_dot = new_board.end_dots[move.get_color()]
+        new_board.play_move(move, is_forced)
+        return new_board
+
+    def apply(self, move, is_forced=None):
+        """
+        make a move on this board in place, the move can be taken back with
+        undo
+        :param move: the move to make
+        :param is_forced: whether the move is the only legal move, checked on
+        the board when not given
+        """
+        if is_forced is None:
+            is_forced = self.is_forced_move(move)
+        self.undo_stack.append(self.play_move(move, is_forced))
+
+    def undo(self):
+        """
+        take back the last move made with apply
+        """
+        (cell, color_id, color, head, removed_index, current_color,
+         current_cost, self.manhattan_distance, self.dead_cells,
+         self.bad_cells, self.shortest_path_cache) = self.undo_stack.pop()
+        if color_id != EMPTY_COLOR_ID:
+            self.grid[cell] = EMPTY_COLOR_ID
+            self.hash_value ^= self.zobrist_keys.get_cell_key(cell, color_id)
+            for neighbor in self.neighbors[cell]:
+                self.free_neighbors[neighbor] += 1
+        if removed_index is not None:
+            self.remaining_colors.insert(removed_index, color)
+            finished_color_id = self.palette.get_id(color)
+            self.hash_value ^= self.zobrist_keys.get_finished_key(
+                finished_color_id)
+            self.finished_mask &= ~(1 << finished_color_id)
+        self.paths[color] = head
+        self.number_empty_cells += 1
+        self.current_color = current_color
+        self.current_cost = current_cost
+
+    def play_move(self, move, is_forced):
+        """
+        make a move on this board in place
+        :param move: the move to make
+        :param is_forced: whether the move was the only legal move
+        :return: the undo record of the move
+        """
+        color = move.get_color()
+        cell = self.get_cell_index(move.get_x(), move.get_y())
+        filled_color_id = EMPTY_COLOR_ID
+        removed_index = None
+        record_head = self.paths[color]
+        record_color = self.current_color
+        record_cost = self.current_cost
+        record_components = (self.manhattan_distance, self.dead_cells,
+                             self.bad_cells, self.shortest_path_cache)
+        if self.grid[cell] == EMPTY_COLOR_ID:
+            # the end dot cell of a finishing move is already colored
+            filled_color_id = self.palette.get_id(color)
+            self.fill_cell(cell, filled_color_id)
+        self.number_empty_cells -= 1
+        head_x, head_y = record_head
+        # a finishing move ends on the end dot, at distance 0
+        self.manhattan_distance += (
+            self.get_distance_to_end_dot(color, move.get_x(), move.get_y()) -
+            self.get_distance_to_end_dot(color, head_x, head_y))
+        end_dot = self.end_dots[color]
+        is_finishing = self.finished_move(move, end_dot)
+        if self.shortest_path_cache:
+            self.update_shortest_path_cache(color, cell, is_finishing)
         added_cost = 1
-        if self.finished_move(move, end_dot):
-            new_board.remove_color(move.get_color())
+        if is_finishing:
+            removed_index = self.remaining_colors.index(color)
+            self.remove_color(color)
             added_cost = 0
         else:
-            new_board.paths[move.get_color()] = (move.get_x(), move.get_y())
-        if self.is_forced_move(move):
+            self.paths[color] = (move.get_x(), move.get_y())
+        if is_forced:
             added_cost = 0
-        new_board.current_cost += added_cost
-        return new_board
+        self.current_cost += added_cost
+        return (cell, filled_color_id, color, record_head, removed_index,
+                record_color, record_cost) + record_components
 
     def is_goal_state(self):
         """
@@ -274,18 +802,36 @@ class Board:
     def __eq__(self, other):
         """
         Check if two boards are equal - have the same state and remaining colors
+        the hashes are compared first, the full compare is done only when they
+        match
         :param other: the other board to compare
         :return: true if the boards are equal, false otherwise
         """
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if self.game_board[i][j] != other.game_board[i][j]:
-                    return False
-        return self.remaining_colors == other.remaining_colors
+        return (self.hash_value == other.hash_value and
+                self.grid == other.grid and
+                self.remaining_colors == other.remaining_colors)
+
+    def get_state_key(self):
+        """
+        Get a compact immutable key of the board state, for the closed sets of
+        the searches. Two boards have the same key exactly when they are
+        equal.
+        :return: the cell colors followed by the finished colors bitmask, as
+        bytes
+        """
+        stats = self.stats
+        if stats is not None:
+            start_time = time.perf_counter()
+        state_key = bytes(self.grid) + self.finished_mask.to_bytes(
+            (self.palette.get_number_of_colors() + 7) // 8, 'little')
+        if stats is not None:
+            stats.record_hashing(time.perf_counter() - start_time)
+        return state_key
 
     def __hash__(self):
         """
-        Hash the board by hashing the game board and the remaining colors
+        Hash the board by its zobrist hash, which covers the game board and the
+        finished colors
         :return: the hash of the board
         """
-        return hash((str(self.game_board), str(self.remaining_colors)))
+        return self.hash_value
@@ -0,0 +1,205 @@
+from flow_game.adjacency import DIRECTIONS
+from flow_game.palette import EMPTY_COLOR_ID
+
+DEFAULT_COLOR_STRATEGY = "wall_then_fewest_moves"
+
+
+class ColorSelectionStrategy:
+    """
+    This class is the base of the rules that choose the next color to play
+    once a color is finished. A rule ranks the remaining colors by a static
+    priority and then a dynamic priority, lower first, and the first color
+    with the lowest pair is played. Only the current color ever moves, so the
+    head of every remaining color is still its start dot and the static
+    priority, which only looks at the dots, is computed once per level. The
+    colors are kept in a priority index sorted by static priority, and a
+    choice skips the finished colors and stops at the first static priority
+    above the best color found.
+    """
+    # whether the colors with the same static priority are ranked by the
+    # board, otherwise the first remaining color of the index is played
+    has_dynamic_priority = True
+
+    def get_static_priority(self, board, color):
+        """
+        Get the priority of a color that only depends on the dots of the level
+        :param board: the board of the level
+        :param color: the color to rank
+        :return: the static priority, lower is played first
+        """
+        return 0
+
+    def get_context(self, board):
+        """
+        Get what the dynamic priorities of one choice share, computed once
+        per choice
+        :param board: the board to choose on
+        :return: the shared values, None if there are none
+        """
+        return None
+
+    def get_dynamic_priority(self, board, color, context):
+        """
+        Get the priority of a color that depends on the cells of the board
+        :param board: the board to choose on
+        :param color: the color to rank
+        :param context: the values of get_context
+        :return: the dynamic priority, lower is played first
+        """
+        return 0
+
+    def build_index(self, board):
+        """
+        Build the priority index of a level, shared by all its boards
+        :param board: the starting board of the level
+        :return: tuple of the (static priority, color) pairs, sorted by
+        static priority and then by the order of the colors on the board
+        """
+        return tuple(sorted(
+            ((self.get_static_priority(board, color), color) for color in
+             board.remaining_colors), key=lambda entry: entry[0]))
+
+    def choose(self, board, index):
+        """
+        Choose the next color to play
+        :param board: the board to choose on
+        :param index: the priority index of the level
+        :return: the color to play, None if all the colors are finished
+        """
+        paths = board.paths
+        context = self.get_context(board) if self.has_dynamic_priority \
+            else None
+        best_color, best_priority = None, None
+        for static_priority, color in index:
+            if color not in paths:
+                continue
+            if not self.has_dynamic_priority:
+                return color
+            if best_priority is not None and \
+                    static_priority > best_priority[0]:
+                break
+            priority = (static_priority,
+                        self.get_dynamic_priority(board, color, context))
+            if best_priority is None or priority < best_priority:
+                best_color, best_priority = color, priority
+        return best_color
+
+
+class WallThenFewestMovesStrategy(ColorSelectionStrategy):
+    """
+    The rule the board always used: the colors whose head is next to a wall
+    first, then the color with the fewest moves.
+    """
+
+    def get_static_priority(self, board, color):
+        """
+        Rank the colors whose head is next to a wall first
+        :param board: the board of the level
+        :param color: the color to rank
+        :return: 0 if the head is next to a wall, 1 otherwise
+        """
+        x, y = board.paths[color]
+        cell_neighbors = board.neighbors[board.get_cell_index(x, y)]
+        return 0 if len(cell_neighbors) < len(DIRECTIONS) else 1
+
+    def get_dynamic_priority(self, board, color, context):
+        """
+        Rank the colors by their number of moves
+        :param board: the board to choose on
+        :param color: the color to rank
+        :param context: unused
+        :return: the number of moves of the color
+        """
+        return board.get_number_of_moves_for_color(color)
+
+
+class MostConstrainedStrategy(ColorSelectionStrategy):
+    """
+    The color with the fewest moves first, wherever its head is.
+    """
+
+    def get_dynamic_priority(self, board, color, context):
+        """
+        Rank the colors by their number of moves
+        :param board: the board to choose on
+        :param color: the color to rank
+        :param context: unused
+        :return: the number of moves of the color
+        """
+        return board.get_number_of_moves_for_color(color)
+
+
+class ShortestDistanceStrategy(ColorSelectionStrategy):
+    """
+    The color whose head is closest to its end dot first, by manhattan
+    distance. The distance is static, so the choice is the first remaining
+    color of the index.
+    """
+    has_dynamic_priority = False
+
+    def get_static_priority(self, board, color):
+        """
+        Rank the colors by the distance from their head to their end dot
+        :param board: the board of the level
+        :param color: the color to rank
+        :return: the manhattan distance of the color
+        """
+        x, y = board.paths[color]
+        end_dot = board.end_dots[color]
+        return abs(x - end_dot.get_x()) + abs(y - end_dot.get_y())
+
+
+class FewestReachableCellsStrategy(ColorSelectionStrategy):
+    """
+    The color whose head touches the fewest empty cells first, counting the
+    cells of every empty region next to the head.
+    """
+
+    def get_context(self, board):
+        """
+        Group the empty cells to regions and count the cells of each region
+        :param board: the board to choose on
+        :return: the union-find parent of every cell and the size of every
+        region, by its root cell
+        """
+        regions = board.get_empty_regions()
+        region_sizes = {}
+        for cell in range(board.board_size ** 2):
+            if board.grid[cell] != EMPTY_COLOR_ID:
+                continue
+            root = board.find_region(regions, cell)
+            region_sizes[root] = region_sizes.get(root, 0) + 1
+        return regions, region_sizes
+
+    def get_dynamic_priority(self, board, color, context):
+        """
+        Rank the colors by the number of empty cells their head can reach
+        :param board: the board to choose on
+        :param color: the color to rank
+        :param context: the regions and region sizes of get_context
+        :return: the number of empty cells next to the head of the color
+        """
+        regions, region_sizes = context
+        x, y = board.paths[color]
+        return sum(region_sizes[root] for root in board.get_touching_regions(
+            regions, board.get_cell_index(x, y)))
+
+
+# the built in strategies, by name
+COLOR_STRATEGIES = {
+    "wall_then_fewest_moves": WallThenFewestMovesStrategy,
+    "most_constrained": MostConstrainedStrategy,
+    "shortest_distance": ShortestDistanceStrategy,
+    "fewest_reachable_cells": FewestReachableCellsStrategy,
+}
+
+
+def get_color_strategy(name=DEFAULT_COLOR_STRATEGY):
+    """
+    Get a built in color selection strategy by its name
+    :param name: the name of the strategy, one of COLOR_STRATEGIES
+    :return: the strategy
+    """
+    if name not in COLOR_STRATEGIES:
+        raise ValueError(f'Unknown color selection strategy: {name}')
+    return COLOR_STRATEGIES[name]()
@@ -1,7 +1,9 @@
 class Dot:
     """
-    A class to represent a dot in the game.
+    A class to represent a dot in the game. Dots are immutable.
     """
+    __slots__ = ('x', 'y', 'color', 'is_goal')
+
     def __init__(self, x, y, color, is_goal):
         """
         Constructor for the Dot class.
@@ -10,11 +12,23 @@ class Dot:
         :param color: color of the dot
         :param is_goal: whether the dot is a goal dot
         """
-        self.x = x
-        self.y = y
-        self.color = color
-        self.is_goal = is_goal
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+        object.__setattr__(self, 'color', color)
+        object.__setattr__(self, 'is_goal', is_goal)
+
+    def __setattr__(self, name, value):
+        """
+        Dots are immutable.
+        """
+        raise AttributeError(f'{type(self).__name__} is immutable')
 
+    def __reduce__(self):
+        """
+        Pickles the dot by its constructor arguments.
+        :return: the class and the constructor arguments
+        """
+        return Dot, (self.x, self.y, self.color, self.is_goal)
 
     def get_x(self):
         """
@@ -1,3 +1,5 @@
+import time
+
 from flow_game.board import Board
 
 
@@ -7,13 +9,27 @@ class FlowFreeProblem:
     puzzle. This class is used by the solvers.
     """
 
-    def __init__(self, board_size, dots_list):
+    def __init__(self, board_size, dots_list, prune_dead_regions=True,
+                 chain_forced_moves=True, stats=None, color_strategy=None):
         """
         Constructor for the FlowFreeProblem class.
         :param board_size: size of the board
         :param dots_list: list of the start dots on the board
+        :param prune_dead_regions: whether to drop successors whose empty
+        regions can no longer be filled
+        :param chain_forced_moves: whether every successor keeps making the
+        forced moves that follow it, up to the next branching point. The
+        actions are then tuples of the moves of the chain.
+        :param stats: search stats collector, shared with the boards and read
+        by the solvers, None to not collect
+        :param color_strategy: the rule that chooses the next color to play
+        once a color is finished, the default strategy of color_selection if
+        None
         """
-        self.board = Board(board_size, dots_list)
+        self.board = Board(board_size, dots_list, stats, color_strategy)
+        self.stats = stats
+        self.prune_dead_regions = prune_dead_regions
+        self.chain_forced_moves = chain_forced_moves
         self.expanded = 0
         self.board_size = board_size
         self.dots_list = dots_list
@@ -48,8 +64,164 @@ class FlowFreeProblem:
         :return: list of successors
         """
         self.expanded = self.expanded + 1
-        return [(state.do_move(move), move, 1) for move in (
-            state.get_legal_moves())]
+        if self.stats is not None:
+            start_time = time.perf_counter()
+        successors = []
+        legal_moves = state.get_legal_moves()
+        for move in legal_moves:
+            successor = state.do_move(move, len(legal_moves) == 1)
+            action = move
+            if self.chain_forced_moves:
+                action = self.play_forced_moves(successor, [move])
+                if action is None:
+                    continue
+            if not self.is_dead_state(successor):
+                successors.append((successor, action, 1))
+        if self.stats is not None:
+            self.stats.record_successors(len(successors),
+                                         time.perf_counter() - start_time)
+        return successors
+
+    def play_forced_moves(self, state, chain):
+        """
+        Makes the forced moves that follow a move on the given state, in place
+        and without undo records, until a branching point or a goal state.
+        :param state: state to make the forced moves on
+        :param chain: list of the moves made so far, extended in place
+        :return: the chain of moves as a tuple, or None if it ends in a state
+        with no legal moves
+        """
+        while not state.is_goal_state():
+            legal_moves = state.get_legal_moves()
+            if not legal_moves:
+                return None
+            if len(legal_moves) > 1:
+                break
+            state.play_move(legal_moves[0], True)
+            chain.append(legal_moves[0])
+        return tuple(chain)
+
+    def apply_action(self, state, move, is_forced=None):
+        """
+        Makes the given move in place on the given state, followed by its
+        forced moves when chaining them. The action can be taken back with
+        undo_action.
+        :param state: state to make the move on
+        :param move: legal move of the state
+        :param is_forced: whether the move is the only legal move of the
+        state, checked on the state when not given
+        :return: the action that was made, or None if it leads to a dead state
+        (the state is then left unchanged)
+        """
+        if self.stats is not None:
+            start_time = time.perf_counter()
+        state.apply(move, is_forced)
+        chain = [move]
+        is_dead = False
+        while self.chain_forced_moves and not state.is_goal_state():
+            legal_moves = state.get_legal_moves()
+            if len(legal_moves) != 1:
+                is_dead = not legal_moves
+                break
+            state.apply(legal_moves[0], True)
+            chain.append(legal_moves[0])
+        if is_dead or self.is_dead_state(state):
+            for _ in chain:
+                state.undo()
+            chain = None
+        if self.stats is not None:
+            self.stats.record_action(time.perf_counter() - start_time)
+        if chain is None:
+            return None
+        return tuple(chain) if self.chain_forced_moves else move
+
+    def undo_action(self, state, action):
+        """
+        Takes back an action made with apply_action.
+        :param state: state to take the action back on
+        :param action: the last action made on the state
+        """
+        for _ in range(len(action) if self.chain_forced_moves else 1):
+            state.undo()
+
+    def get_moves_of_actions(self, actions):
+        """
+        Returns the board moves of the given actions, unrolling the chains of
+        forced moves.
+        :param actions: actions to unroll
+        :return: list of the moves of the actions
+        """
+        if not self.chain_forced_moves:
+            return actions
+        return [move for chain in actions for move in chain]
+
+    def get_moves_to_state(self, target):
+        """
+        Returns the moves that lead from the start state to the given state,
+        for searches that keep the states but not the paths to them. Only the
+        moves that fill a cell with its color in the given state are tried, so
+        the search almost never backtracks.
+        :param target: state reached from the start state by legal moves
+        :return: list of the moves, or None if the state can not be reached
+        """
+        state = self.board.__copy__()
+        target_key = target.get_state_key()
+        if state.get_state_key() == target_key:
+            return []
+        moves = []
+        fringe = [iter(self.get_moves_towards(state, target))]
+        while fringe:
+            move = next(fringe[-1], None)
+            if move is None:
+                fringe.pop()
+                if moves:
+                    moves.pop()
+                    state.undo()
+                continue
+            state.apply(move)
+            moves.append(move)
+            if state.get_state_key() == target_key:
+                return moves
+            fringe.append(iter(self.get_moves_towards(state, target)))
+        return None
+
+    def get_moves_towards(self, state, target):
+        """
+        Returns the legal moves of the given state that fill a cell with the
+        color it has in the target state.
+        :param state: state to get moves from
+        :param target: state to move towards
+        :return: list of the legal moves towards the target
+        """
+        palette = state.palette
+        return [move for move in state.get_legal_moves() if
+                target.grid[state.get_cell_index(move.get_x(), move.get_y())]
+                == palette.get_id(move.get_color())]
+
+    def is_dead_state(self, state):
+        """
+        Returns whether the given state can no longer reach a goal state,
+        because of empty regions that can not be filled.
+        :param state: state to check
+        :return: whether the state is dead
+        """
+        return self.prune_dead_regions and state.has_dead_regions()
+
+    def get_actions(self, state):
+        """
+        Returns the legal actions of the given state, for searches that make
+        the moves in place instead of creating the successors.
+        :param state: state to get actions from
+        :return: list of legal actions
+        """
+        self.expanded = self.expanded + 1
+        if self.stats is None:
+            return state.get_legal_moves()
+        start_time = time.perf_counter()
+        legal_moves = state.get_legal_moves()
+        self.stats.record_successors(len(legal_moves),
+                                     time.perf_counter() - start_time)
+        return legal_moves
 
     def get_cost_of_actions(self, actions):
         """
@@ -1,7 +1,10 @@
 class Move:
     """
     Represents a move in the game. A move is a tuple of two points and a color.
+    Moves are immutable, so one move object can be shared by every board.
     """
+    __slots__ = ('x', 'y', 'color')
+
     def __init__(self, x, y, color):
         """
         Constructor for the Move class.
@@ -9,9 +12,22 @@ class Move:
         :param y: y coordinate of the move
         :param color: color of the move
         """
-        self.x = x
-        self.y = y
-        self.color = color
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+        object.__setattr__(self, 'color', color)
+
+    def __setattr__(self, name, value):
+        """
+        Moves are immutable.
+        """
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        """
+        Pickles the move by its constructor arguments.
+        :return: the class and the constructor arguments
+        """
+        return Move, (self.x, self.y, self.color)
 
     def get_x(self):
         """
@@ -40,7 +56,8 @@ class Move:
         :param other: the other move to compare to
         :return: whether the two moves are equal
         """
-        return self.x == other.x and self.y == other.y and self.color == other.color
+        return self is other or (self.x == other.x and self.y == other.y and
+                                 self.color == other.color)
 
     def __hash__(self):
         """
@@ -48,3 +65,49 @@ class Move:
         :return: hash of the move
         """
         return hash((self.x, self.y, self.color))
+
+
+class MovePool:
+    """
+    Holds one shared Move for every (x, y, color) of a board size, so
+    generating moves does not allocate.
+    """
+    def __init__(self, board_size):
+        """
+        Constructor for the MovePool class.
+        :param board_size: size of the board
+        """
+        self.board_size = board_size
+        self.moves = [{} for _ in range(board_size ** 2)]
+
+    def get_move(self, x, y, color):
+        """
+        Get the shared move of a cell and color, creating it on first use.
+        :param x: x coordinate of the move
+        :param y: y coordinate of the move
+        :param color: color of the move
+        :return: the shared move
+        """
+        cell_moves = self.moves[x * self.board_size + y]
+        move = cell_moves.get(color)
+        if move is None:
+            move = Move(x, y, color)
+            cell_moves[color] = move
+        return move
+
+
+# cache of the move pools, by board size
+move_pools = {}
+
+
+def get_move_pool(board_size):
+    """
+    Get the move pool of a board size, creating it on first use.
+    :param board_size: size of the board
+    :return: the move pool
+    """
+    pool = move_pools.get(board_size)
+    if pool is None:
+        pool = MovePool(board_size)
+        move_pools[board_size] = pool
+    return pool
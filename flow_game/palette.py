@@ -0,0 +1,51 @@
+EMPTY_CELL = "black"
+EMPTY_COLOR_ID = 0
+
+
+class Palette:
+    """
+    This class maps the color names of a level to compact integer ids, so the
+    board can be stored as a flat array of small integers. Id 0 is always the
+    empty cell.
+    """
+    def __init__(self, colors):
+        """
+        Constructor for the palette
+        :param colors: the color names of the level, in a fixed order
+        """
+        self.names = [EMPTY_CELL] + [color for color in colors]
+        self.ids = {color: color_id for color_id, color in
+                    enumerate(self.names)}
+
+    @classmethod
+    def from_dots(cls, dots_list):
+        """
+        Create a palette from a list of dots, keeping the order in which the
+        colors first appear
+        :param dots_list: the list of dots of the level
+        :return: the palette of the level
+        """
+        return cls(dict.fromkeys(dot.get_color() for dot in dots_list))
+
+    def get_id(self, color):
+        """
+        Get the id of a color name
+        :param color: the color name
+        :return: the id of the color
+        """
+        return self.ids[color]
+
+    def get_name(self, color_id):
+        """
+        Get the color name of an id
+        :param color_id: the id of the color
+        :return: the color name
+        """
+        return self.names[color_id]
+
+    def get_number_of_colors(self):
+        """
+        Get the number of colors in the palette, including the empty cell
+        :return: the number of colors in the palette
+        """
+        return len(self.names)
@@ -0,0 +1,73 @@
+import random
+
+ZOBRIST_KEY_BITS = 64
+
+# cache of the zobrist keys, by board size and number of colors
+zobrist_keys_cache = {}
+
+
+class ZobristKeys:
+    """
+    This class holds the random keys used to hash boards of a specific size.
+    A board hash is the XOR of the keys of its filled cells (cell, color) and
+    of the keys of its finished colors, so a move updates it in O(1).
+    """
+    def __init__(self, board_size, number_of_colors):
+        """
+        Constructor for the zobrist keys
+        :param board_size: the size of the board
+        :param number_of_colors: the number of color ids, including the empty
+        cell
+        """
+        # a fixed seed keeps the hashes equal between runs and processes
+        generator = random.Random(board_size * 1000 + number_of_colors)
+        self.number_of_colors = number_of_colors
+        self.cell_keys = [0 if color_id == 0 else
+                          generator.getrandbits(ZOBRIST_KEY_BITS)
+                          for _ in range(board_size ** 2)
+                          for color_id in range(number_of_colors)]
+        self.finished_keys = [generator.getrandbits(ZOBRIST_KEY_BITS) for _
+                              in range(number_of_colors)]
+
+    def get_cell_key(self, cell, color_id):
+        """
+        Get the key of a cell filled with a color
+        :param cell: the index of the cell
+        :param color_id: the id of the color
+        :return: the key of the cell and color
+        """
+        return self.cell_keys[cell * self.number_of_colors + color_id]
+
+    def get_finished_key(self, color_id):
+        """
+        Get the key of a finished color
+        :param color_id: the id of the color
+        :return: the key of the finished color
+        """
+        return self.finished_keys[color_id]
+
+    def hash_grid(self, grid):
+        """
+        Compute the hash of a grid from scratch
+        :param grid: the flat grid of color ids
+        :return: the hash of the grid
+        """
+        hash_value = 0
+        for cell, color_id in enumerate(grid):
+            hash_value ^= self.cell_keys[cell * self.number_of_colors +
+                                         color_id]
+        return hash_value
+
+
+def get_zobrist_keys(board_size, number_of_colors):
+    """
+    Get the zobrist keys for a board size, creating them on first use
+    :param board_size: the size of the board
+    :param number_of_colors: the number of color ids, including the empty cell
+    :return: the zobrist keys
+    """
+    keys = zobrist_keys_cache.get((board_size, number_of_colors))
+    if keys is None:
+        keys = ZobristKeys(board_size, number_of_colors)
+        zobrist_keys_cache[(board_size, number_of_colors)] = keys
+    return keys
@@ -1,4 +1,5 @@
 import tkinter as tk
+from flow_game.adjacency import get_neighbor_coords
 
 
 class FlowFreeGUI:
@@ -105,21 +106,21 @@ class FlowFreeGUI:
         Connect the adjacent cells of the same color.
         :param game_board: the game board with color names
         """
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        # the boards are square, so the neighbor table of the width is used
+        neighbor_coords = get_neighbor_coords(self.board_width)
         for i in range(self.board_height):
             for j in range(self.board_width):
                 color = game_board[i][j]
                 if color != 'black':
-                    for di, dj in directions:
-                        ni, nj = i + di, j + dj
-                        if 0 <= ni < self.board_height and 0 <= nj < self.board_width:
-                            if game_board[ni][nj] == color:
-                                self.cells[i][j].lift("all")
-                                self.cells[i][j].create_line(
-                                    self.cell_size // 2, self.cell_size // 2,
-                                    self.cell_size // 2 + self.cell_size * dj,
-                                    self.cell_size // 2 + self.cell_size * di,
-                                    fill=color, width=20)
+                    for ni, nj in neighbor_coords[i * self.board_width + j]:
+                        if game_board[ni][nj] == color:
+                            di, dj = ni - i, nj - j
+                            self.cells[i][j].lift("all")
+                            self.cells[i][j].create_line(
+                                self.cell_size // 2, self.cell_size // 2,
+                                self.cell_size // 2 + self.cell_size * dj,
+                                self.cell_size // 2 + self.cell_size * di,
+                                fill=color, width=20)
 
     def update_labels(self):
         """
@@ -1,10 +1,17 @@
 import tkinter as tk
 import time
+import multiprocessing
+import queue
 
+from flow_game.board import Board
 from flow_game.flow_free_problem import FlowFreeProblem
+from flow_game.palette import Palette, EMPTY_COLOR_ID
 from problems.level_creator import create_level
 from solvers import solver
-from solvers.SAT import FlowFreeSAT
+from solvers import parallel_search
+from solvers import external_search
+from solvers.heuristic_cache import MemoizedHeuristic
+from solvers.SAT import FlowFreeSAT, validate_sat_solution
 from solvers.q_learning_agent import QLearningAgent
 from solvers.flow_free_env import FlowFreeEnvironment
 from gui import FlowFreeGUI
@@ -14,23 +21,57 @@ from solvers.approx_q_learning import ApproxQLearningAgent
 SAT_NO_SOLUTION = "UNSAT"
 NO_SOLUTION_MESSAGE = "No solution found."
 SOLUTION_FOUND_MESSAGE = "Solution found."
+PORTFOLIO_ENGINES = ["A*", "DFS", "SAT"]
+PORTFOLIO_POLL_INTERVAL = 0.1
 
 
-def run_search_algorithm(search_algorithm_name, problem):
+def run_search_algorithm(search_algorithm_name, problem,
+                         weight=solver.DEFAULT_WEIGHT, budget=None,
+                         heuristic_name=heuristics.DEFAULT_HEURISTIC,
+                         memoize_heuristic=False,
+                         time_limit=solver.ANYTIME_TIME_LIMIT):
     """
     Run the search algorithm on the given problem.
     :param search_algorithm_name: name of the search algorithm to run
     :param problem: the problem to solve
-    :return: a list of actions that reaches the goal state
+    :param weight: the weight of the heuristic for "WA*" and "AWA*"
+    :param budget: budget of the search, None for no limit
+    :param heuristic_name: the name of the heuristic of the informed
+    searches, one of heuristics.HEURISTICS
+    :param memoize_heuristic: whether to keep the latest heuristic values in
+    a bounded cache, which pays off when the searches evaluate the same
+    states again, like the iterations of "IDA*"
+    :param time_limit: seconds "AWA*" looks for a solution with fewer
+    actions after the first one, None until the budget runs out
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out
     """
+    heuristic = heuristics.get_heuristic(heuristic_name)
+    if memoize_heuristic:
+        heuristic = MemoizedHeuristic(heuristic)
     if search_algorithm_name == "DFS":
-        return solver.depth_first_search(problem)
+        return solver.depth_first_search(problem, budget=budget)
     elif search_algorithm_name == "UCS":
-        return solver.uniform_cost_search(problem)
+        return solver.uniform_cost_search(problem, budget=budget)
     elif search_algorithm_name == "A*":
-        return solver.a_star_search(problem, heuristics.combined_heuristic)
+        return solver.a_star_search(problem, heuristic, budget=budget)
+    elif search_algorithm_name == "WA*":
+        return solver.weighted_a_star_search(
+            problem, heuristic, weight, budget=budget)
+    elif search_algorithm_name == "AWA*":
+        return solver.anytime_weighted_a_star_search(
+            problem, heuristic, weight, time_limit=time_limit, budget=budget)
     elif search_algorithm_name == "BFS":
-        return solver.breadth_first_search(problem)
+        return solver.breadth_first_search(problem, budget=budget)
+    elif search_algorithm_name == "IDA*":
+        return solver.iterative_deepening_a_star_search(
+            problem, heuristic, budget=budget)
+    elif search_algorithm_name == "HDA*":
+        return parallel_search.hash_distributed_a_star_search(
+            problem, heuristic, budget=budget)
+    elif search_algorithm_name == "EBFS":
+        return external_search.external_breadth_first_search(problem,
+                                                             budget=budget)
 
 
 def choose_rl_agent(agent_name):
@@ -70,7 +111,7 @@ def execute_actions_with_delay(gui, curr_state, actions, index=0):
     if index < len(actions):
         action = actions[index]
         curr_state = curr_state.do_move(action)
-        gui.update_board(curr_state.game_board)
+        gui.update_board(curr_state.get_color_board())
         gui.root.after(500, lambda: execute_actions_with_delay(gui, curr_state,
                                                                actions,
                                                                index + 1))
@@ -117,12 +158,11 @@ def convert_dots_to_sat_problem(dots):
     :return: list of colors and a dictionary representing the board
     """
     dot_dict = {}
-    colors = set()
+    palette = Palette.from_dots(dots)
     for dot in dots:
-        colors.add(dot.get_color())
         pos = (dot.get_x(), dot.get_y())
         dot_dict[pos] = dot.get_color()
-    return list(colors), dot_dict
+    return palette.names[EMPTY_COLOR_ID + 1:], dot_dict
 
 
 def solve_with_sat(algorithm_name, problem, dots_list):
@@ -190,7 +230,7 @@ def display_gui(problem, algorithm_name, actions, elapsed_time):
     if actions:
         # Display the initial state and start executing actions with a delay
         curr_state = problem.get_start_state()
-        gui.update_board(curr_state.game_board)
+        gui.update_board(curr_state.get_color_board())
         root.after(500, execute_actions_with_delay, gui, curr_state, actions)
     else:
         gui.display_lost_message()  # Display "You Lost" message if no actions
@@ -201,6 +241,9 @@ def display_gui(problem, algorithm_name, actions, elapsed_time):
 # dictionary of solvers
 solvers = {"A*": solve_with_search, "DFS": solve_with_search,
            "BFS": solve_with_search, "UCS": solve_with_search,
+           "WA*": solve_with_search, "AWA*": solve_with_search,
+           "IDA*": solve_with_search, "HDA*": solve_with_search,
+           "EBFS": solve_with_search,
            "SAT": solve_with_sat, "Q learning": solve_with_rl,
            "AQ learning": solve_with_rl}
 
@@ -217,6 +260,92 @@ def solve_game(algorithm, grid_size, dots_list):
     solvers.get(algorithm)(algorithm, problem, dots_list)
 
 
+def run_portfolio_engine(engine, grid_size, dots_list, results):
+    """
+    Run a single engine of the portfolio and put its solution on the results
+    queue. This runs in a separate process.
+    :param engine: name of the engine, "SAT" or a search algorithm name
+    :param grid_size: the size of the grid
+    :param dots_list: list of dots representing the board initial state
+    :param results: queue to put the (engine, solution) pair on
+    """
+    if engine == "SAT":
+        colors, initial_board = convert_dots_to_sat_problem(dots_list)
+        sat_solver = FlowFreeSAT(grid_size, colors, initial_board)
+        solution = sat_solver.solve(dots_list)
+        if solution != SAT_NO_SOLUTION:
+            solution = sat_solver.convert_sol_to_board(solution)
+    else:
+        problem = FlowFreeProblem(grid_size, dots_list)
+        solution = run_search_algorithm(engine, problem)
+    results.put((engine, solution))
+
+
+def is_portfolio_solution_valid(engine, solution, grid_size, dots_list):
+    """
+    Verify the solution of a portfolio engine.
+    :param engine: name of the engine that found the solution
+    :param solution: solved board for SAT, list of moves for the searches
+    :param grid_size: the size of the grid
+    :param dots_list: list of dots representing the board initial state
+    :return: True if the solution solves the level, False otherwise
+    """
+    if engine == "SAT":
+        return solution != SAT_NO_SOLUTION and validate_sat_solution(
+            solution, dots_list)
+    if not solution:
+        return False
+    state = Board(grid_size, dots_list)
+    for move in solution:
+        if move not in state.get_legal_moves():
+            return False
+        state = state.do_move(move)
+    return state.is_goal_state()
+
+
+def solve_portfolio(dots_list, grid_size, engines=None):
+    """
+    Race several engines on the same level, each in its own process, and
+    return the first verified solution. The other engines are stopped.
+    :param dots_list: list of dots representing the board initial state
+    :param grid_size: the size of the grid
+    :param engines: names of the engines to race, "SAT" or search algorithm
+    names, PORTFOLIO_ENGINES if None
+    :return: the name of the engine and its solution (a solved board for SAT,
+    a list of moves for the searches), or None, None if no engine solved it
+    """
+    if engines is None:
+        engines = PORTFOLIO_ENGINES
+    results = multiprocessing.Queue()
+    processes = {engine: multiprocessing.Process(
+        target=run_portfolio_engine,
+        args=(engine, grid_size, dots_list, results), daemon=True)
+        for engine in engines}
+    for process in processes.values():
+        process.start()
+    pending = set(processes)
+    try:
+        while pending:
+            try:
+                engine, solution = results.get(
+                    timeout=PORTFOLIO_POLL_INTERVAL)
+            except queue.Empty:
+                # an engine that crashed will never put a result
+                pending = {engine for engine in pending if
+                           processes[engine].exitcode in (None, 0)}
+                continue
+            pending.discard(engine)
+            if is_portfolio_solution_valid(engine, solution, grid_size,
+                                           dots_list):
+                return engine, solution
+        return None, None
+    finally:
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+
 def main():
     """
     Main function to solve a level with a specific algorithm.
@@ -67,16 +67,16 @@ def create_level(grid_size, level_number):
     # Convert the image to RGB (OpenCV loads images in BGR by default)
     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
-    # Initialize a list to store Dot objects
-    dots = []
+    # Initialize a list to store the (row, col, color) of the dots
+    cells = []
 
     # Identify the grid cell size (assuming the image is perfectly aligned)
     height, width, _ = image.shape
     cell_width = width // grid_size
     cell_height = height // grid_size
 
-    # Dictionary to store colors and their goal status
-    color_to_dots = {}
+    # Dictionary to store colors and the indices of their cells
+    color_to_cells = {}
 
     # Iterate over each cell in the grid
     for row in range(grid_size):
@@ -105,17 +105,18 @@ def create_level(grid_size, level_number):
             if color_name == 'black':
                 continue
 
-            # Create a Dot object for this cell
-            dot = Dot(x=row, y=col, color=color_name, is_goal=False)
-            dots.append(dot)
-            if color_name in color_to_dots:
-                color_to_dots[color_name].append(dot)
+            # Store the cell of the dot
+            cells.append((row, col, color_name))
+            if color_name in color_to_cells:
+                color_to_cells[color_name].append(len(cells) - 1)
             else:
-                color_to_dots[color_name] = [dot]
+                color_to_cells[color_name] = [len(cells) - 1]
 
     # Randomly assign one of each color as the goal dot
-    for color, dot_list in color_to_dots.items():
-        goal_dot = random.choice(dot_list)
-        goal_dot.is_goal = True
+    goal_cells = set()
+    for color, cell_list in color_to_cells.items():
+        goal_cells.add(random.choice(cell_list))
 
-    return dots
\ No newline at end of file
+    # Create the Dot objects, which can not change once created
+    return [Dot(x=row, y=col, color=color_name, is_goal=index in goal_cells)
+            for index, (row, col, color_name) in enumerate(cells)]
\ No newline at end of file
@@ -374,28 +374,24 @@ def create_line_graph(search_results, sat_results):
     # Save the line graph
     fig.write_image('All_Algorithms_Line_Graph.png')
 
-def compare_heuristics():
+def compare_heuristics(results_path='csvs/Heuristic_results.csv'):
     """
     Compare the number of nodes expanded by different heuristics in the A* algorithm.
+    :param results_path: path of the results table of
+    benchmarks/heuristic_comparison.py, one row per grid size, level and
+    heuristic
     """
-    # Read the data into DataFrames
-    df_md = pd.read_csv("csvs/A_star_md.csv")
-    df_combined = pd.read_csv("csvs/A_star_good_heuristic.csv")
+    results = pd.read_csv(results_path)
 
-    # Add a column to each DataFrame to indicate the heuristic type
-    df_md['Heuristic'] = 'Manhattan Distance Heuristic'
-    df_combined['Heuristic'] = 'Combined Heuristic'
-
-    # Concatenate the two DataFrames
-    df_combined = pd.concat([df_md, df_combined])
-
-    # Create a line plot comparing the two heuristics
-    fig = px.line(df_combined, x='level', y='expended nodes',
-                  color='Heuristic', markers=True,
+    # Create a line plot comparing the heuristics, one panel per grid size
+    fig = px.line(results, x='level', y='expended nodes',
+                  color='heuristic', facet_col='grid size', markers=True,
+                  log_y=True,
                   labels={
                       "level": "Level",
                       "expended nodes": "Expended Nodes",
-                      "Heuristic": "Heuristic"
+                      "heuristic": "Heuristic",
+                      "grid size": "Grid Size"
                   },
                   title="Comparison of Nodes Expanded by Different Heuristics in A* Algorithm")
 
@@ -1,5 +1,10 @@
 import pycosat
+from flow_game.adjacency import get_neighbor_coords
 from solvers.util import LinkedList
+from solvers.budget import PROPAGATIONS_EXHAUSTED
+
+# answer of pycosat when the propagation limit was reached
+SAT_UNKNOWN = "UNKNOWN"
 
 
 class FlowFreeSAT:
@@ -242,12 +247,7 @@ class FlowFreeSAT:
         :param c: column
         :return: list of neighbors
         """
-        neighbors = []
-        if r > 0: neighbors.append((r - 1, c))  # Up
-        if r < self.board_size - 1: neighbors.append((r + 1, c))  # Down
-        if c > 0: neighbors.append((r, c - 1))  # Left
-        if c < self.board_size - 1: neighbors.append((r, c + 1))  # Right
-        return neighbors
+        return get_neighbor_coords(self.board_size)[r * self.board_size + c]
 
     def add_constraints(self):
         """
@@ -259,17 +259,31 @@ class FlowFreeSAT:
         self.add_direction_same_color_constraints()
         self.completing_direction_neighbors_constraints()
 
-    def solve(self, dots_list):
+    def solve(self, dots_list, budget=None):
         """
         Solve the Flow Free game using the SAT solver.
         :param dots_list: list of the starting dots
-        :return: solution
+        :param budget: budget of the solver, None for no limit. the solver
+        calls count as expanded nodes, the propagation limit applies to each
+        call and the clock and memory are checked between the calls.
+        :return: solution, or a partial result if the budget ran out, with
+        the number of clauses as its frontier size
         """
         self.add_constraints()
         is_solution_without_cycle = False
         solution = None
+        solver_calls = 0
+        propagation_limit = 0 if budget is None or \
+            budget.max_propagations is None else budget.max_propagations
         while not is_solution_without_cycle:
-            solution = pycosat.solve(self.cnf)
+            if budget is not None and (budget.is_exhausted(solver_calls) or
+                                       budget.check_clock_and_memory()):
+                return budget.get_partial_result(len(self.cnf))
+            solution = pycosat.solve(self.cnf, prop_limit=propagation_limit)
+            solver_calls += 1
+            if solution == SAT_UNKNOWN:
+                budget.set_exhausted(PROPAGATIONS_EXHAUSTED)
+                continue
             if solution == "UNSAT":
                 return solution
             solution_board = self.convert_sol_to_board(solution)
@@ -308,7 +322,7 @@ def is_path_connected(board, start_dot, end_dot):
     """
     visited = set()
     stack = [(start_dot.get_x(), start_dot.get_y())]
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    neighbor_coords = get_neighbor_coords(len(board))
 
     while stack:
         x, y = stack.pop()
@@ -316,10 +330,8 @@ def is_path_connected(board, start_dot, end_dot):
             return True
         if (x, y) not in visited:
             visited.add((x, y))
-            for dx, dy in directions:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < len(board) and 0 <= ny < len(board[0]) and \
-                        board[nx][ny] == start_dot.get_color():
+            for nx, ny in neighbor_coords[x * len(board) + y]:
+                if board[nx][ny] == start_dot.get_color():
                     stack.append((nx, ny))
     return False
 
@@ -331,10 +343,13 @@ def validate_sat_solution(sat_solution, dots_list):
     :param dots_list: list of dots representing the initial board
     :return: True if the solution is valid, False otherwise
     """
-    for i in range(0, len(dots_list), 2):
-        start_dot = dots_list[i]
-        end_dot = dots_list[i + 1]
-        if not is_path_connected(sat_solution, start_dot, end_dot):
+    if any(cell == '.' for row in sat_solution for cell in row):
+        return False
+    start_dots = {dot.get_color(): dot for dot in dots_list if
+                  not dot.get_is_goal()}
+    for end_dot in dots_list:
+        if end_dot.get_is_goal() and not is_path_connected(
+                sat_solution, start_dots[end_dot.get_color()], end_dot):
             return False
     return True
 
@@ -417,7 +432,7 @@ def find_path(board, start_x, start_y, color, visited):
     :param visited: set of visited coordinates
     :return: path
     """
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    neighbor_coords = get_neighbor_coords(len(board))
     path = LinkedList()
     x, y = start_x, start_y
 
@@ -426,10 +441,8 @@ def find_path(board, start_x, start_y, color, visited):
         visited.add((x, y))
         found_next = False
 
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < len(board) and 0 <= ny < len(board[0]) and (
-                    nx, ny) not in visited:
+        for nx, ny in neighbor_coords[x * len(board) + y]:
+            if (nx, ny) not in visited:
                 if board[nx][ny] == color:
                     x, y = nx, ny
                     found_next = True
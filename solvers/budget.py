@@ -0,0 +1,170 @@
+import resource
+import sys
+import time
+
+# number of budget checks between two reads of the clock and the memory
+CHECK_INTERVAL = 256
+NODES_EXHAUSTED = "nodes"
+MEMORY_EXHAUSTED = "memory"
+TIME_EXHAUSTED = "time"
+PROPAGATIONS_EXHAUSTED = "propagations"
+
+
+def get_memory_usage():
+    """
+    Get the resident set size of the process. Without /proc (on mac OS) the
+    peak resident set size is used instead.
+    :return: the memory usage in bytes
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # mac OS reports bytes, the other systems kilobytes
+        return peak_memory if sys.platform == 'darwin' else peak_memory * 1024
+
+
+class PartialResult:
+    """
+    This class is the result of an engine that ran out of its budget before
+    finding a solution. It is empty and false like an empty list of moves,
+    so callers that only look for a solution treat it as no solution.
+    """
+    __slots__ = ('reason', 'nodes_expanded', 'frontier_size', 'best_depth',
+                 'elapsed_time')
+
+    def __init__(self, reason, nodes_expanded, frontier_size, best_depth,
+                 elapsed_time):
+        """
+        Constructor for the partial result
+        :param reason: the limit of the budget that ran out
+        :param nodes_expanded: the number of nodes expanded
+        :param frontier_size: the number of nodes left in the frontier
+        :param best_depth: the largest path cost of an expanded node
+        :param elapsed_time: the seconds the engine ran
+        """
+        self.reason = reason
+        self.nodes_expanded = nodes_expanded
+        self.frontier_size = frontier_size
+        self.best_depth = best_depth
+        self.elapsed_time = elapsed_time
+
+    def __bool__(self):
+        """
+        A partial result is not a solution
+        :return: False
+        """
+        return False
+
+    def __len__(self):
+        """
+        A partial result has no moves
+        :return: 0
+        """
+        return 0
+
+    def __iter__(self):
+        """
+        Iterate over the moves of the partial result, there are none
+        :return: an empty iterator
+        """
+        return iter(())
+
+    def __repr__(self):
+        """
+        Representation of the partial result
+        :return: the fields of the partial result
+        """
+        return (f'PartialResult(reason={self.reason!r}, '
+                f'nodes_expanded={self.nodes_expanded}, '
+                f'frontier_size={self.frontier_size}, '
+                f'best_depth={self.best_depth}, '
+                f'elapsed_time={self.elapsed_time:.3f})')
+
+
+class Budget:
+    """
+    This class holds the limits of one run of an engine: expanded nodes,
+    memory, wall clock time and SAT propagations. The engines check it once
+    per expansion. The node limit is checked on every call, the clock and
+    the memory only every CHECK_INTERVAL calls, so a check is cheap. Once a
+    limit is reached the budget stays exhausted.
+    """
+    def __init__(self, max_nodes=None, max_memory=None, time_limit=None,
+                 max_propagations=None, check_interval=CHECK_INTERVAL):
+        """
+        Constructor for the budget, the clock starts when it is created
+        :param max_nodes: the maximal number of expanded nodes
+        :param max_memory: the maximal resident set size in bytes
+        :param time_limit: the maximal running time in seconds
+        :param max_propagations: the maximal number of propagations of one
+        SAT solver call
+        :param check_interval: number of checks between two reads of the
+        clock and the memory
+        None means no limit for all the limits.
+        """
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.max_propagations = max_propagations
+        self.check_interval = check_interval
+        self.start_time = time.perf_counter()
+        self.deadline = None if time_limit is None else \
+            self.start_time + time_limit
+        self.checks_until_clock = 0
+        self.nodes_expanded = 0
+        self.best_depth = 0
+        self.exhausted_reason = None
+
+    def is_exhausted(self, nodes_expanded, depth=0):
+        """
+        Check the budget, called by the engines once per expansion
+        :param nodes_expanded: the number of nodes the engine expanded
+        :param depth: the path cost of the node being expanded
+        :return: True if a limit was reached, False otherwise
+        """
+        self.nodes_expanded = nodes_expanded
+        if depth > self.best_depth:
+            self.best_depth = depth
+        if self.exhausted_reason is not None:
+            return True
+        if self.max_nodes is not None and nodes_expanded >= self.max_nodes:
+            self.exhausted_reason = NODES_EXHAUSTED
+            return True
+        self.checks_until_clock -= 1
+        if self.checks_until_clock > 0:
+            return False
+        self.checks_until_clock = self.check_interval
+        return self.check_clock_and_memory()
+
+    def check_clock_and_memory(self):
+        """
+        Check the time and memory limits right away, for engines that check
+        the budget rarely, like the SAT solver between its calls
+        :return: True if a limit was reached, False otherwise
+        """
+        if self.exhausted_reason is not None:
+            return True
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.exhausted_reason = TIME_EXHAUSTED
+        elif self.max_memory is not None and \
+                get_memory_usage() >= self.max_memory:
+            self.exhausted_reason = MEMORY_EXHAUSTED
+        return self.exhausted_reason is not None
+
+    def set_exhausted(self, reason):
+        """
+        Mark the budget as exhausted by a limit the engine checks itself
+        :param reason: the limit that was reached
+        """
+        self.exhausted_reason = reason
+
+    def get_partial_result(self, frontier_size):
+        """
+        Get the partial result of the engine that ran out of this budget
+        :param frontier_size: the number of nodes left in the frontier
+        :return: the partial result
+        """
+        return PartialResult(self.exhausted_reason, self.nodes_expanded,
+                             frontier_size, self.best_depth,
+                             time.perf_counter() - self.start_time)
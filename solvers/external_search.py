@@ -0,0 +1,250 @@
+import heapq
+import mmap
+import os
+import tempfile
+
+# number of records held in memory before they are written to disk as
+# sorted runs
+RUN_SIZE = 2 ** 16
+
+
+def write_run(records, path, key_size):
+    """
+    Sort records, drop the records whose state key is a duplicate and write
+    them to a file
+    :param records: list of fixed length byte records
+    :param path: the path of the file to write
+    :param key_size: the length of the state key that starts every record
+    :return: the number of records written
+    """
+    records.sort()
+    records = list(remove_duplicates(records, key_size))
+    with open(path, 'wb') as run_file:
+        run_file.write(b''.join(records))
+    return len(records)
+
+
+def remove_duplicates(records, key_size):
+    """
+    Drop the records whose state key is equal to the key of the record
+    before them
+    :param records: iterable of records, sorted
+    :param key_size: the length of the state key that starts every record
+    :return: generator of the records with distinct state keys
+    """
+    last_key = None
+    for record in records:
+        key = record[:key_size]
+        if key != last_key:
+            last_key = key
+            yield record
+
+
+def read_records(path, record_size):
+    """
+    Stream the records of a file through a memory map, the file is paged in
+    by the operating system instead of being read into memory
+    :param path: the path of the file
+    :param record_size: the length of a record
+    :return: generator of the records of the file
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as records_file, \
+            mmap.mmap(records_file.fileno(), 0,
+                      access=mmap.ACCESS_READ) as records_map:
+        for offset in range(0, len(records_map), record_size):
+            yield records_map[offset:offset + record_size]
+
+
+def merge_runs(run_paths, layer_path, record_size, key_size):
+    """
+    Merge sorted runs into one sorted file without duplicate state keys, the
+    runs are streamed so the memory does not depend on their size. The runs
+    are deleted.
+    :param run_paths: the paths of the sorted runs
+    :param layer_path: the path of the merged file to write
+    :param record_size: the length of a record
+    :param key_size: the length of the state key that starts every record
+    :return: the number of records in the merged file
+    """
+    count = 0
+    runs = [read_records(path, record_size) for path in run_paths]
+    with open(layer_path, 'wb') as layer_file:
+        for record in remove_duplicates(heapq.merge(*runs), key_size):
+            layer_file.write(record)
+            count += 1
+    for path in run_paths:
+        os.remove(path)
+    return count
+
+
+class LayeredDiskFrontier:
+    """
+    Class to represent a frontier of byte records split into layers, that
+    keeps at most run_size records in memory. When there are more, every
+    layer in memory is sorted and written to disk as a run. A layer is taken
+    out free of duplicate state keys: from memory if it was never written,
+    otherwise by merging its runs into one file that is streamed back.
+    """
+
+    def __init__(self, directory, record_size, key_size, run_size=RUN_SIZE):
+        """
+        Constructor for the LayeredDiskFrontier class.
+        :param directory: the directory to write the runs in
+        :param record_size: the length of a record
+        :param key_size: the length of the state key that starts every record
+        :param run_size: the number of records held in memory
+        """
+        self.directory = directory
+        self.record_size = record_size
+        self.key_size = key_size
+        self.run_size = run_size
+        self.records = {}
+        self.runs = {}
+        self.run_lengths = {}
+        self.number_in_memory = 0
+        self.number_on_disk = 0
+        self.number_of_files = 0
+
+    def get_file_path(self, name):
+        """
+        Get a new file path in the directory of the frontier.
+        :param name: the kind of the file
+        :return: the path of the file
+        """
+        self.number_of_files += 1
+        return os.path.join(self.directory,
+                            f'{name}_{self.number_of_files}.bin')
+
+    def push(self, layer, record):
+        """
+        Push a record into a layer, writing the records in memory to disk
+        when there are run_size of them.
+        :param layer: the layer of the record
+        :param record: the record to push
+        """
+        self.records.setdefault(layer, []).append(record)
+        self.number_in_memory += 1
+        if self.number_in_memory >= self.run_size:
+            for layer_in_memory, records in self.records.items():
+                self.write_layer_run(layer_in_memory, records)
+            self.records = {}
+            self.number_in_memory = 0
+
+    def write_layer_run(self, layer, records):
+        """
+        Write records of a layer to disk as a sorted run.
+        :param layer: the layer of the records
+        :param records: list of the records
+        """
+        run_path = self.get_file_path('run')
+        run_length = write_run(records, run_path, self.key_size)
+        self.runs.setdefault(layer, []).append(run_path)
+        self.run_lengths[layer] = self.run_lengths.get(layer, 0) + run_length
+        self.number_on_disk += run_length
+
+    def pop_layer(self):
+        """
+        Pop the lowest layer, without duplicate state keys. The records of a
+        layer that was written to disk are streamed from a file that is
+        deleted once the returned generator is done or closed.
+        :return: the layer, the number of its records and an iterator over
+        them
+        """
+        layer = min(set(self.records) | set(self.runs))
+        records = self.records.pop(layer, [])
+        self.number_in_memory -= len(records)
+        if layer not in self.runs:
+            records.sort()
+            records = list(remove_duplicates(records, self.key_size))
+            return layer, len(records), iter(records)
+        if records:
+            self.write_layer_run(layer, records)
+        self.number_on_disk -= self.run_lengths.pop(layer)
+        layer_path = self.get_file_path('layer')
+        layer_length = merge_runs(self.runs.pop(layer), layer_path,
+                                  self.record_size, self.key_size)
+        return layer, layer_length, self.stream_layer(layer_path)
+
+    def stream_layer(self, layer_path):
+        """
+        Stream the records of a merged layer file, and delete it after.
+        :param layer_path: the path of the layer file
+        :return: generator of the records of the layer
+        """
+        try:
+            yield from read_records(layer_path, self.record_size)
+        finally:
+            os.remove(layer_path)
+
+    def is_empty(self):
+        """
+        Check if the frontier is empty.
+        :return: True if the frontier is empty, False otherwise
+        """
+        return not self.records and not self.runs
+
+    def __len__(self):
+        """
+        Get the number of records in the frontier, before the duplicates are
+        dropped.
+        :return: the number of records in the frontier
+        """
+        return self.number_in_memory + self.number_on_disk
+
+
+# External BFS
+def external_breadth_first_search(problem, run_size=RUN_SIZE,
+                                  directory=None, budget=None):
+    """
+    run a layered breadth first search that keeps its states on disk.
+    every move fills one cell, so all the paths to a state have the same
+    number of moves and the states can be searched in layers of that number.
+    a layer only holds duplicates of its own states, and is made free of
+    them with an external sort before it is searched, so there is no closed
+    set. memory holds about twice run_size states at most: the layer being
+    searched and the states waiting to be written. the moves to the goal are
+    rebuilt from the colors of the goal board.
+    :param problem: the problem to solve.
+    :param run_size: the number of states held in memory before they are
+    written to disk.
+    :param directory: the directory of the temporary files, the default
+    temporary directory if None.
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
+    """
+    start_state = problem.get_start_state()
+    if problem.is_goal_state(start_state):
+        return []
+    stats = problem.stats
+    start_empty_cells = start_state.number_empty_cells
+    with tempfile.TemporaryDirectory(dir=directory) as work_directory:
+        fringe = LayeredDiskFrontier(
+            work_directory, start_state.get_bytes_length(),
+            len(start_state.get_state_key()), run_size)
+        fringe.push(0, start_state.to_bytes())
+        while not fringe.is_empty():
+            layer, layer_length, layer_records = fringe.pop_layer()
+            try:
+                for record in layer_records:
+                    layer_length -= 1
+                    if budget is not None and \
+                            budget.is_exhausted(problem.expanded, layer):
+                        return budget.get_partial_result(
+                            layer_length + 1 + len(fringe))
+                    if stats is not None:
+                        stats.record_frontier(layer_length + len(fringe), 0)
+                    state = start_state.from_bytes(record)
+                    for successor, action, step_cost in \
+                            problem.get_successors(state):
+                        if problem.is_goal_state(successor):
+                            return problem.get_moves_to_state(successor)
+                        fringe.push(start_empty_cells -
+                                    successor.number_empty_cells,
+                                    successor.to_bytes())
+            finally:
+                if hasattr(layer_records, 'close'):
+                    layer_records.close()
+    return []
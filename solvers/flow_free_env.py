@@ -6,11 +6,8 @@ def is_dot_free(state, dot):
     :return: whether the dot is free
     """
     x, y = state.paths[dot]
-    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-    for direction in directions:
-        dx, dy = direction
-        if state.is_coord_valid(x + dx, y + dy) and \
-                state.game_board[x + dx][y + dy] == "black":
+    for next_x, next_y in state.neighbor_coords[state.get_cell_index(x, y)]:
+        if state.is_cell_empty(next_x, next_y):
             return True
     return False
 
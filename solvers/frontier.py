@@ -0,0 +1,118 @@
+import heapq
+from collections import deque
+
+
+def prefer_deeper_nodes(node):
+    """
+    Tie breaker that pops the node with the higher path cost first. With
+    f = g + h this is the node with the lower heuristic value.
+    :param node: search node
+    :return: tie breaking key, lower is popped first
+    """
+    return -node.cost
+
+
+class FifoFrontier:
+    """
+    Class to represent a FIFO frontier, backed by a deque so push and pop are
+    both O(1).
+    """
+
+    def __init__(self):
+        """
+        Constructor for the FifoFrontier class.
+        """
+        self.items = deque()
+
+    def push(self, item):
+        """
+        Push the 'item' into the frontier.
+        :param item: the item to push
+        """
+        self.items.append(item)
+
+    def pop(self):
+        """
+        Pop the oldest item from the frontier.
+        :return: the oldest item
+        """
+        return self.items.popleft()
+
+    def is_empty(self):
+        """
+        Check if the frontier is empty.
+        :return: True if the frontier is empty, False otherwise
+        """
+        return not self.items
+
+    def __len__(self):
+        """
+        Get the number of items in the frontier.
+        :return: the number of items in the frontier
+        """
+        return len(self.items)
+
+
+class BucketPriorityQueue:
+    """
+    Class to represent a priority queue for priorities with few distinct
+    values, like the integer path costs of the searches. Items with the same
+    priority and tie breaking key share a bucket, and only the distinct keys
+    are kept in a heap, so the items are never compared.
+    Inside a bucket the last pushed item is popped first.
+    """
+
+    def __init__(self, tie_breaker=None):
+        """
+        Constructor for the BucketPriorityQueue class.
+        :param tie_breaker: function from an item to an integer, between
+        items of the same priority the lower value is popped first. None keeps
+        the priority alone.
+        """
+        self.tie_breaker = tie_breaker
+        self.buckets = {}
+        self.keys = []
+        self.size = 0
+
+    def push(self, item, priority):
+        """
+        Push the 'item' into the priority queue with the given 'priority'.
+        :param item: item to push
+        :param priority: priority of the item, lower is popped first
+        """
+        key = (priority, self.tie_breaker(item) if self.tie_breaker else 0)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = []
+            self.buckets[key] = bucket
+            heapq.heappush(self.keys, key)
+        bucket.append(item)
+        self.size += 1
+
+    def pop(self):
+        """
+        Pop an item with the lowest priority from the priority queue.
+        :return: an item with the lowest priority
+        """
+        key = self.keys[0]
+        bucket = self.buckets[key]
+        item = bucket.pop()
+        if not bucket:
+            del self.buckets[key]
+            heapq.heappop(self.keys)
+        self.size -= 1
+        return item
+
+    def is_empty(self):
+        """
+        Check if the priority queue is empty.
+        :return: True if the priority queue is empty, False otherwise
+        """
+        return self.size == 0
+
+    def __len__(self):
+        """
+        Get the number of items in the priority queue.
+        :return: the number of items in the priority queue
+        """
+        return self.size
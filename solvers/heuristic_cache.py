@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+# number of heuristic values a memoized heuristic keeps by default
+HEURISTIC_CACHE_SIZE = 2 ** 16
+
+
+class MemoizedHeuristic:
+    """
+    This class wraps a heuristic and keeps its most recently used values,
+    so a state generated again from another parent is not evaluated again.
+    The values are keyed on the state key, the cost and the flow cells of
+    the board: the heuristics add the cost, and the state key leaves out
+    the flow cells the distances are measured from, so the cached values
+    are exactly the values of the heuristic. At most max_size values are
+    kept, the least recently used is dropped first. The hits and the misses
+    are also counted in the search stats of the boards, when they have one.
+    """
+    def __init__(self, heuristic, max_size=HEURISTIC_CACHE_SIZE):
+        """
+        Constructor for the memoized heuristic
+        :param heuristic: the heuristic function to memoize
+        :param max_size: the maximal number of values kept
+        """
+        self.heuristic = heuristic
+        self.max_size = max_size
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, board):
+        """
+        Get the heuristic value of a board, from the cache when it is there
+        :param board: the board to evaluate
+        :return: the heuristic value of the board
+        """
+        key = (board.get_state_key(), board.get_cost(),
+               tuple(board.paths.values()))
+        values = self.values
+        try:
+            value = values[key]
+        except KeyError:
+            self.misses += 1
+            if board.stats is not None:
+                board.stats.record_heuristic_cache(False)
+            value = self.heuristic(board)
+            values[key] = value
+            if len(values) > self.max_size:
+                values.popitem(last=False)
+            return value
+        values.move_to_end(key)
+        self.hits += 1
+        if board.stats is not None:
+            board.stats.record_heuristic_cache(True)
+        return value
+
+    def get_hit_rate(self):
+        """
+        Get the share of the calls answered from the cache
+        :return: the hit rate, 0 before the first call
+        """
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
@@ -1,6 +1,6 @@
-EMPTY_CELL = "black"
+import numpy as np
 
-directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+from flow_game.palette import EMPTY_COLOR_ID
 
 
 def get_manhattan_distance(board):
@@ -12,7 +12,26 @@ def get_manhattan_distance(board):
     return manhattan_distance
 
 
+# the components are kept up to date by the board with every move, so the
+# heuristic does not scan the board
 def combined_heuristic(board):
+    return (board.get_manhattan_distance() + board.get_empty_cell_count() +
+            board.get_cost() + len(board.remaining_colors) +
+            2 * board.get_dead_cell_count() + 2 * board.get_bad_cell_count())
+
+
+# combined_heuristic with the shortest paths through the empty cells instead
+# of the manhattan distances, which ignore the walls made by the other flows.
+# the board caches the paths and a move only drops the paths it blocks
+def shortest_path_heuristic(board):
+    return (board.get_shortest_path_distance() +
+            board.get_empty_cell_count() + board.get_cost() +
+            len(board.remaining_colors) + 2 * board.get_dead_cell_count() +
+            2 * board.get_bad_cell_count())
+
+
+# the same value as combined_heuristic, computed over the whole board
+def combined_heuristic_with_loops(board):
     manhattan_distance = get_manhattan_distance(board)
     return (manhattan_distance + count_empty_cells(board) + board.get_cost() +
             len(board.remaining_colors) + 2 * count_dead_cells(board) +
@@ -20,10 +39,8 @@ def combined_heuristic(board):
 
 
 def is_all_directions_are_blocked(i,j,board):
-    for direction in directions:
-        dx, dy = direction
-        if board.is_coord_valid(i + dx, j + dy) and \
-                board.game_board[i + dx][j + dy] == EMPTY_CELL:
+    for neighbor in board.neighbors[board.get_cell_index(i, j)]:
+        if board.grid[neighbor] == EMPTY_COLOR_ID:
             return False
     return True
 
@@ -32,7 +49,7 @@ def count_dead_cells(board):
     number_of_dead_cells = 0
     for i in range(board.board_size):
         for j in range(board.board_size):
-            if board.game_board[i][j] == EMPTY_CELL:
+            if board.is_cell_empty(i, j):
                 dead_end = is_all_directions_are_blocked(i,j,board)
                 if dead_end:
                     number_of_dead_cells += 1
@@ -43,17 +60,15 @@ def count_empty_cells(board):
     number_of_empty_cells = 0
     for i in range(board.board_size):
         for j in range(board.board_size):
-            if board.game_board[i][j] == EMPTY_CELL:
+            if board.is_cell_empty(i, j):
                 number_of_empty_cells += 1
     return number_of_empty_cells
 
 
 def count_same_color_neighbor(i,j, color, board):
     count = 0
-    for direction in directions:
-        dx, dy = direction
-        if board.is_coord_valid(i + dx, j + dy) and \
-                board.game_board[i + dx][j + dy] == color:
+    for neighbor in board.neighbors[board.get_cell_index(i, j)]:
+        if board.grid[neighbor] == color:
             count += 1
     return count
 
@@ -64,8 +79,8 @@ def count_bad_cells(board):
     bad_cells = 0
     for i in range(board.board_size):
         for j in range(board.board_size):
-            if board.game_board[i][j] != EMPTY_CELL:
-                color = board.game_board[i][j]
+            color = board.grid[board.get_cell_index(i, j)]
+            if color != EMPTY_COLOR_ID:
                 num_of_same_color_neighbor = count_same_color_neighbor(i,j, color, board)
                 if num_of_same_color_neighbor > 2:
                     bad_cells += 1
@@ -74,3 +89,77 @@ def count_bad_cells(board):
 
 def simple_effective_heuristic(board):
     return board.get_cost() + count_empty_cells(board)
+
+
+# the vectorized versions of the counting heuristics below return the same
+# values, they work on a numpy view of the board cells (no copy) and count
+# the neighbors by comparing the grid with itself shifted by one cell
+def get_grid_view(board):
+    return np.frombuffer(board.grid, dtype=np.uint8).reshape(
+        board.board_size, board.board_size)
+
+
+# the number of neighbors of every cell with the same color id as the cell,
+# for an empty cell this is its number of empty neighbors
+def get_same_color_neighbor_counts(grid):
+    counts = np.zeros(grid.shape, dtype=np.uint8)
+    vertical = grid[1:, :] == grid[:-1, :]
+    counts[1:, :] += vertical
+    counts[:-1, :] += vertical
+    horizontal = grid[:, 1:] == grid[:, :-1]
+    counts[:, 1:] += horizontal
+    counts[:, :-1] += horizontal
+    return counts
+
+
+def count_empty_cells_vectorized(board):
+    return int(np.count_nonzero(get_grid_view(board) == EMPTY_COLOR_ID))
+
+
+def count_dead_cells_vectorized(board):
+    grid = get_grid_view(board)
+    return int(np.count_nonzero((grid == EMPTY_COLOR_ID) &
+                                (get_same_color_neighbor_counts(grid) == 0)))
+
+
+def count_bad_cells_vectorized(board):
+    grid = get_grid_view(board)
+    return int(np.count_nonzero((grid != EMPTY_COLOR_ID) &
+                                (get_same_color_neighbor_counts(grid) > 2)))
+
+
+# the same value as combined_heuristic_with_loops, the neighbor counts are
+# shared by the dead and the bad cells
+def combined_heuristic_vectorized(board):
+    grid = get_grid_view(board)
+    empty = grid == EMPTY_COLOR_ID
+    counts = get_same_color_neighbor_counts(grid)
+    dead_cells = np.count_nonzero(empty & (counts == 0))
+    bad_cells = np.count_nonzero(~empty & (counts > 2))
+    return int(get_manhattan_distance(board) + np.count_nonzero(empty) +
+               board.get_cost() + len(board.remaining_colors) +
+               2 * dead_cells + 2 * bad_cells)
+
+
+DEFAULT_HEURISTIC = "combined"
+
+# the heuristics that can be chosen by name, for the solvers and the
+# heuristic comparison benchmark. the vectorized and loop versions of the
+# combined heuristic give the same values and are left out
+HEURISTICS = {
+    "manhattan": get_manhattan_distance,
+    "simple": simple_effective_heuristic,
+    "combined": combined_heuristic,
+    "shortest_path": shortest_path_heuristic,
+}
+
+
+def get_heuristic(name=DEFAULT_HEURISTIC):
+    """
+    Get a registered heuristic by its name
+    :param name: the name of the heuristic, one of HEURISTICS
+    :return: the heuristic function
+    """
+    if name not in HEURISTICS:
+        raise ValueError(f'Unknown heuristic: {name}')
+    return HEURISTICS[name]
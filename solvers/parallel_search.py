@@ -0,0 +1,281 @@
+import multiprocessing
+import queue
+import time
+
+from solvers.util import SearchNode
+from solvers.budget import PartialResult
+from solvers.search_stats import SearchStats
+from solvers.frontier import BucketPriorityQueue
+from solvers.frontier import prefer_deeper_nodes
+from solvers.solver import null_heuristic
+
+NUMBER_OF_WORKERS = 4
+# maximal number of states sent to another worker in one message
+BATCH_SIZE = 64
+# seconds an idle worker waits for a message before checking the stop event
+IDLE_WAIT = 0.01
+
+
+class TerminationDetector:
+    """
+    This class detects when all the workers of a distributed search ran out
+    of work. A batch is counted as outstanding from before it is sent until
+    its receiver takes it, and the receiver leaves the idle state in the same
+    step, so once all the workers are idle with no outstanding batch there
+    is no state left anywhere.
+    """
+    def __init__(self, number_of_workers):
+        """
+        Constructor for the termination detector
+        :param number_of_workers: the number of workers of the search
+        """
+        self.number_of_workers = number_of_workers
+        self.lock = multiprocessing.Lock()
+        self.outstanding_batches = multiprocessing.Value('i', 0, lock=False)
+        self.idle_workers = multiprocessing.Value('i', 0, lock=False)
+
+    def batch_sent(self):
+        """
+        Count a batch that is about to be sent, called by its sender
+        """
+        with self.lock:
+            self.outstanding_batches.value += 1
+
+    def batch_received(self, was_idle):
+        """
+        Count a batch taken by its receiver
+        :param was_idle: whether the receiver was idle until this batch
+        """
+        with self.lock:
+            self.outstanding_batches.value -= 1
+            if was_idle:
+                self.idle_workers.value -= 1
+
+    def become_idle(self):
+        """
+        Count a worker that has no states left and sent all its batches
+        """
+        with self.lock:
+            self.idle_workers.value += 1
+
+    def is_finished(self):
+        """
+        Check if the search ran out of work
+        :return: True if all the workers are idle with no outstanding batch
+        """
+        with self.lock:
+            return self.idle_workers.value == self.number_of_workers and \
+                self.outstanding_batches.value == 0
+
+
+def get_owner(state, number_of_workers):
+    """
+    Get the worker that owns a state. The zobrist hash does not depend on
+    the process, so every worker agrees on the owner.
+    :param state: the state
+    :param number_of_workers: the number of workers of the search
+    :return: the index of the owner worker
+    """
+    return state.hash_value % number_of_workers
+
+
+def send_batch(outboxes, inboxes, worker, termination):
+    """
+    Send the batch of states waiting for a worker, if there is one
+    :param outboxes: the batches waiting to be sent, by worker
+    :param inboxes: the message queues of the workers
+    :param worker: the index of the worker to send to
+    :param termination: the termination detector of the search
+    """
+    if outboxes[worker]:
+        termination.batch_sent()
+        inboxes[worker].put(outboxes[worker])
+        outboxes[worker] = []
+
+
+def run_hash_distributed_worker(worker_id, problem, heuristic, inboxes,
+                                results, termination, stop, budget=None):
+    """
+    Run one worker of the hash distributed A* search. The worker keeps the
+    open and closed lists of the states it owns, expands the best of them
+    and sends every successor to its owner, with its path cost and
+    priority. The successors of one expansion are sent as one batch per
+    owner at the end of the expansion: holding them back for more
+    expansions delays the best states of the search at every hop between
+    workers, and the other workers expand worse states meanwhile. A found
+    goal and, at the end, the number of expanded nodes, the size of the open
+    list, the largest expanded path cost, the limit of the budget that ran
+    out and the search stats are put on the results queue.
+    :param worker_id: the index of the worker
+    :param problem: the problem to solve
+    :param heuristic: the heuristic function to use
+    :param inboxes: the message queues of the workers
+    :param results: queue of the (kind, worker id, value) results
+    :param termination: the termination detector of the search
+    :param stop: event set when the search should stop
+    :param budget: budget of the worker, None for no limit
+    """
+    template = problem.get_start_state()
+    if problem.stats is not None:
+        # a forked worker starts with the stats of its parent, it collects
+        # its own and they are merged back
+        problem.stats = SearchStats()
+        template.stats = problem.stats
+        heuristic = problem.stats.time_heuristic(heuristic)
+    # a forked worker starts with the count of its parent
+    start_expanded = problem.expanded
+    number_of_workers = len(inboxes)
+    inbox = inboxes[worker_id]
+    fringe = BucketPriorityQueue(prefer_deeper_nodes)
+    visited = set()
+    outboxes = [[] for _ in range(number_of_workers)]
+    is_idle = False
+    while not stop.is_set():
+        if fringe.is_empty() and not is_idle:
+            for worker in range(number_of_workers):
+                send_batch(outboxes, inboxes, worker, termination)
+            termination.become_idle()
+            is_idle = True
+        try:
+            if fringe.is_empty():
+                batch = inbox.get(timeout=IDLE_WAIT)
+            else:
+                batch = inbox.get_nowait()
+        except queue.Empty:
+            batch = None
+        if batch is not None:
+            termination.batch_received(is_idle)
+            is_idle = False
+            for record, cost, priority in batch:
+                state = template.from_record(record)
+                if state.get_state_key() not in visited:
+                    fringe.push(SearchNode(state, cost=cost), priority)
+                elif problem.stats is not None:
+                    problem.stats.record_duplicate()
+            continue
+        if fringe.is_empty():
+            if termination.is_finished():
+                stop.set()
+            continue
+        node = fringe.pop()
+        state = node.state
+        if problem.is_goal_state(state):
+            results.put(('goal', worker_id, state.to_record()))
+            stop.set()
+            break
+        state_key = state.get_state_key()
+        if state_key in visited:
+            if problem.stats is not None:
+                problem.stats.record_duplicate()
+            continue
+        if budget is not None and budget.is_exhausted(
+                problem.expanded - start_expanded, node.cost):
+            stop.set()
+            break
+        visited.add(state_key)
+        if problem.stats is not None:
+            problem.stats.record_frontier(len(fringe), len(visited))
+        for successor, action, step_cost in problem.get_successors(state):
+            cost = node.cost + step_cost
+            owner = get_owner(successor, number_of_workers)
+            if owner == worker_id:
+                if successor.get_state_key() not in visited:
+                    fringe.push(SearchNode(successor, cost=cost),
+                                cost + heuristic(successor))
+                elif problem.stats is not None:
+                    problem.stats.record_duplicate()
+            else:
+                priority = cost + heuristic(successor)
+                outboxes[owner].append((successor.to_record(), cost,
+                                        priority))
+                if len(outboxes[owner]) >= BATCH_SIZE:
+                    send_batch(outboxes, inboxes, owner, termination)
+        for worker in range(number_of_workers):
+            send_batch(outboxes, inboxes, worker, termination)
+    exhausted_reason = None if budget is None else budget.exhausted_reason
+    best_depth = 0 if budget is None else budget.best_depth
+    results.put(('expanded', worker_id,
+                 (problem.expanded - start_expanded, len(fringe), best_depth,
+                  exhausted_reason, problem.stats)))
+    # the batches left in the queues are no longer needed, do not wait for
+    # them to be read before exiting
+    for worker_inbox in inboxes:
+        worker_inbox.cancel_join_thread()
+
+
+# HDA* search
+def hash_distributed_a_star_search(problem, heuristic=null_heuristic,
+                                   number_of_workers=NUMBER_OF_WORKERS,
+                                   budget=None):
+    """
+    run the hash distributed A* search algorithm on the given problem.
+    every state is owned by one worker process, chosen by its zobrist hash,
+    and each worker runs A* on its own states and sends the successors it
+    generates to their owners in batches. the workers keep no paths, the
+    moves to the goal are rebuilt from the colors of the goal board.
+    :param problem: the problem to solve.
+    :param heuristic: the heuristic function to use, it must be picklable.
+    :param number_of_workers: the number of worker processes.
+    :param budget: budget of the search, None for no limit. every worker
+    checks its own copy, so the node and memory limits apply to each worker.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget of a worker ran out.
+    """
+    start_state = problem.get_start_state()
+    inboxes = [multiprocessing.Queue() for _ in range(number_of_workers)]
+    results = multiprocessing.Queue()
+    termination = TerminationDetector(number_of_workers)
+    stop = multiprocessing.Event()
+    owner = get_owner(start_state, number_of_workers)
+    termination.batch_sent()
+    inboxes[owner].put([(start_state.to_record(), 0, 0)])
+    workers = [multiprocessing.Process(
+        target=run_hash_distributed_worker,
+        args=(worker_id, problem, heuristic, inboxes, results, termination,
+              stop, budget), daemon=True)
+        for worker_id in range(number_of_workers)]
+    for worker in workers:
+        worker.start()
+    goal_record = None
+    exhausted_reason = None
+    frontier_size = 0
+    best_depth = 0
+    pending = set(range(number_of_workers))
+    try:
+        while pending:
+            try:
+                kind, worker_id, value = results.get(timeout=IDLE_WAIT)
+            except queue.Empty:
+                # a worker that crashed will never report, and the others
+                # can not finish without its states. a worker that exited
+                # cleanly has put its results before exiting, so it stays
+                # pending until they are read
+                crashed = {worker_id for worker_id in pending if
+                           workers[worker_id].exitcode not in (None, 0)}
+                if crashed:
+                    stop.set()
+                    pending -= crashed
+                continue
+            if kind == 'goal':
+                goal_record = value
+            else:
+                (expanded, worker_frontier_size, worker_best_depth, reason,
+                 worker_stats) = value
+                problem.expanded = problem.expanded + expanded
+                if worker_stats is not None:
+                    problem.stats.merge(worker_stats)
+                frontier_size += worker_frontier_size
+                best_depth = max(best_depth, worker_best_depth)
+                exhausted_reason = exhausted_reason or reason
+                pending.discard(worker_id)
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+    if goal_record is None:
+        if exhausted_reason is not None:
+            return PartialResult(exhausted_reason, problem.expanded,
+                                 frontier_size, best_depth,
+                                 time.perf_counter() - budget.start_time)
+        return []
+    return problem.get_moves_to_state(start_state.from_record(goal_record))
@@ -0,0 +1,145 @@
+import time
+
+
+class SearchStats:
+    """
+    This class collects where the time of a search goes: generating the
+    successors, computing the heuristic and building the state keys of the
+    closed sets, along with the sizes of the frontier and the closed set,
+    the number of pruned duplicates, the branching factor and the hits and
+    misses of a memoized heuristic. A memoized heuristic builds the state
+    key of every board it is called on, so that time counts both in the
+    heuristic time and in the hashing time.
+    Collecting is opt-in. The problem, its boards and the solvers only
+    record when the problem was created with a collector, and otherwise pay
+    a single None check per expansion.
+    """
+    # the columns of get_row, for the results tables
+    COLUMNS = ['successor time', 'heuristic time', 'hashing time',
+               'peak frontier', 'closed set size', 'duplicates pruned',
+               'branching factor', 'heuristic cache hits',
+               'heuristic cache misses']
+
+    def __init__(self):
+        """
+        Constructor for the search stats
+        """
+        self.successor_time = 0.0
+        self.heuristic_time = 0.0
+        self.hashing_time = 0.0
+        self.heuristic_calls = 0
+        self.hashing_calls = 0
+        self.expansions = 0
+        self.successors_generated = 0
+        self.peak_frontier = 0
+        self.closed_set_size = 0
+        self.duplicates_pruned = 0
+        self.heuristic_cache_hits = 0
+        self.heuristic_cache_misses = 0
+
+    def time_heuristic(self, heuristic):
+        """
+        Wrap a heuristic so its calls are timed
+        :param heuristic: the heuristic function to time
+        :return: a heuristic function returning the same values
+        """
+        def timed_heuristic(state):
+            start_time = time.perf_counter()
+            value = heuristic(state)
+            self.heuristic_time += time.perf_counter() - start_time
+            self.heuristic_calls += 1
+            return value
+        return timed_heuristic
+
+    def record_successors(self, number_of_successors, elapsed_time):
+        """
+        Record one expansion of the problem
+        :param number_of_successors: the number of successors or actions
+        generated
+        :param elapsed_time: the seconds spent generating them
+        """
+        self.expansions += 1
+        self.successors_generated += number_of_successors
+        self.successor_time += elapsed_time
+
+    def record_action(self, elapsed_time):
+        """
+        Record an action made in place, the successor generation of the
+        searches that do not copy the states
+        :param elapsed_time: the seconds spent making the action
+        """
+        self.successor_time += elapsed_time
+
+    def record_hashing(self, elapsed_time):
+        """
+        Record the building of one state key
+        :param elapsed_time: the seconds spent building it
+        """
+        self.hashing_calls += 1
+        self.hashing_time += elapsed_time
+
+    def record_frontier(self, frontier_size, closed_set_size):
+        """
+        Record the sizes of the frontier and the closed set of the search
+        :param frontier_size: the number of nodes in the frontier
+        :param closed_set_size: the number of states in the closed set
+        """
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if closed_set_size > self.closed_set_size:
+            self.closed_set_size = closed_set_size
+
+    def record_duplicate(self):
+        """
+        Record a generated state that the search dropped as a duplicate
+        """
+        self.duplicates_pruned += 1
+
+    def record_heuristic_cache(self, is_hit):
+        """
+        Record a call of a memoized heuristic
+        :param is_hit: whether the value was found in the cache
+        """
+        if is_hit:
+            self.heuristic_cache_hits += 1
+        else:
+            self.heuristic_cache_misses += 1
+
+    def get_branching_factor(self):
+        """
+        Get the mean number of successors of an expanded state
+        :return: the branching factor, 0 before the first expansion
+        """
+        if self.expansions == 0:
+            return 0.0
+        return self.successors_generated / self.expansions
+
+    def merge(self, other):
+        """
+        Add the stats of another collector to these, like the collectors of
+        the workers of a parallel search. The peak sizes are added too, which
+        bounds the peak of the searches together.
+        :param other: the other search stats
+        """
+        self.successor_time += other.successor_time
+        self.heuristic_time += other.heuristic_time
+        self.hashing_time += other.hashing_time
+        self.heuristic_calls += other.heuristic_calls
+        self.hashing_calls += other.hashing_calls
+        self.expansions += other.expansions
+        self.successors_generated += other.successors_generated
+        self.peak_frontier += other.peak_frontier
+        self.closed_set_size += other.closed_set_size
+        self.duplicates_pruned += other.duplicates_pruned
+        self.heuristic_cache_hits += other.heuristic_cache_hits
+        self.heuristic_cache_misses += other.heuristic_cache_misses
+
+    def get_row(self):
+        """
+        Get the stats as a row of the results tables
+        :return: list of the values of COLUMNS
+        """
+        return [self.successor_time, self.heuristic_time, self.hashing_time,
+                self.peak_frontier, self.closed_set_size,
+                self.duplicates_pruned, self.get_branching_factor(),
+                self.heuristic_cache_hits, self.heuristic_cache_misses]
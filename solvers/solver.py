@@ -1,70 +1,211 @@
-from solvers.util import Stack
-from solvers.util import Queue
-from solvers.util import PriorityQueue
-from solvers.util import Pair
+import time
+
+from solvers.util import SearchNode
+from solvers.util import TranspositionTable
+from solvers.frontier import FifoFrontier
+from solvers.frontier import BucketPriorityQueue
+from solvers.frontier import prefer_deeper_nodes
+
+TRANSPOSITION_TABLE_SIZE = 2 ** 18
+DEFAULT_WEIGHT = 2
+# seconds the anytime search looks for cheaper solutions after the first one,
+# by default the first solution is returned as soon as it is found
+ANYTIME_TIME_LIMIT = 0
 
 
 # DFS
-def depth_first_search(problem):
+def depth_first_search(problem, fringe=None, budget=None):
     """
     run the depth first search algorithm on the given problem.
     :param problem: the problem to solve.
-    :return: a list of actions that reaches the goal state.
+    :param fringe: LIFO frontier to run a graph search with, by default the
+    search backtracks on a single board. the backtracking search keeps only
+    the current path, so it does not notice a state it already searched
+    when it is reached again by other moves, and expands about 1.2 to 1.4
+    times the nodes of the graph search, for far less memory.
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
     """
-    return general_search(problem, Stack())
+    if fringe is None:
+        return backtracking_search(problem, budget)
+    return general_search(problem, fringe, budget)
 
 
 # BFS
-def breadth_first_search(problem):
+def breadth_first_search(problem, fringe=None, budget=None):
     """
     run the breadth first search algorithm on the given problem.
     :param problem: the problem to solve.
-    :return: a list of actions that reaches the goal state.
+    :param fringe: FIFO frontier to use, a deque based one by default.
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
     """
-    return general_search(problem, Queue())
+    if fringe is None:
+        fringe = FifoFrontier()
+    return general_search(problem, fringe, budget)
 
 
-def general_search(problem, fringe):
+def general_search(problem, fringe, budget=None):
     """
     General search algorithm.
     :param problem: the problem to solve.
     :param fringe: the data structure to use for the search.
-    :return: a list of actions that reaches the goal state.
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
     """
+    stats = problem.stats
     visited = set()
-    fringe.push((problem.get_start_state(), []))
+    fringe.push(SearchNode(problem.get_start_state()))
     while not fringe.is_empty():
-        state, actions = fringe.pop()
+        node = fringe.pop()
+        state = node.state
+        if problem.is_goal_state(state):
+            return problem.get_moves_of_actions(node.get_actions())
+        state_key = state.get_state_key()
+        if state_key in visited:
+            if stats is not None:
+                stats.record_duplicate()
+            continue
+        if budget is not None and \
+                budget.is_exhausted(problem.expanded, node.cost):
+            return budget.get_partial_result(len(fringe))
+        visited.add(state_key)
+        if stats is not None:
+            stats.record_frontier(len(fringe), len(visited))
+        for successor, action, step_cost in problem.get_successors(state):
+            if successor.get_state_key() not in visited:
+                fringe.push(SearchNode(successor, node, action,
+                                       node.cost + step_cost))
+            elif stats is not None:
+                stats.record_duplicate()
+    return []
+
+
+def backtracking_search(problem, budget=None):
+    """
+    Depth first search that makes the moves in place on a single board and
+    takes them back when backtracking, so only the current path is kept in
+    memory.
+    :param problem: the problem to solve.
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
+    """
+    state = problem.get_start_state().__copy__()
+    if problem.is_goal_state(state):
+        return []
+    actions = []
+    # the moves are tried in reverse order, as popped from a stack fringe,
+    # along with whether the move is the only one
+    legal_moves = problem.get_actions(state)
+    fringe = [(reversed(legal_moves), len(legal_moves) == 1)]
+    while fringe:
+        moves, is_forced = fringe[-1]
+        move = next(moves, None)
+        if move is None:
+            fringe.pop()
+            if actions:
+                problem.undo_action(state, actions.pop())
+            continue
+        action = problem.apply_action(state, move, is_forced)
+        if action is None:
+            continue
+        actions.append(action)
         if problem.is_goal_state(state):
-            return actions
-        if state not in visited:
-            visited.add(state)
-            for successor, action, step_cost in problem.get_successors(state):
-                if successor not in visited:
-                    fringe.push((successor, actions + [action]))
+            return problem.get_moves_of_actions(actions)
+        if budget is not None and \
+                budget.is_exhausted(problem.expanded, len(actions)):
+            return budget.get_partial_result(len(fringe))
+        if problem.stats is not None:
+            problem.stats.record_frontier(len(fringe), 0)
+        legal_moves = problem.get_actions(state)
+        fringe.append((reversed(legal_moves), len(legal_moves) == 1))
     return []
 
 
-def uniform_cost_search(problem):
+def uniform_cost_search(problem, fringe=None, budget=None):
     """
     run the uniform cost search algorithm on the given problem.
     :param problem: the problem to solve.
-    :return: a list of actions that reaches the goal state.
+    :param fringe: priority queue to use, a bucket priority queue by default.
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
     """
-    fringe = PriorityQueue()
+    if fringe is None:
+        fringe = BucketPriorityQueue()
+    return best_first_search(problem, fringe, lambda state, cost: cost,
+                             budget)
+
+
+def best_first_search(problem, fringe, evaluation, budget=None):
+    """
+    Best first search algorithm, the base of uniform cost search and A*.
+    the fringe holds at most one live node per state: an index maps every
+    state key in the fringe to its best node, a worse duplicate is dropped
+    when it is generated, and a better one replaces the indexed node, which
+    is skipped when it is popped (a lazy decrease key). nodes are compared
+    by priority and then by path cost, the deeper first, which is the order
+    the default fringes pop them, so the search expands the same nodes as
+    without the index.
+    :param problem: the problem to solve.
+    :param fringe: the priority queue to use for the search.
+    :param evaluation: function from a state and the cost of the path to it
+    to the priority of its node, lower is searched first.
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
+    """
+    stats = problem.stats
     visited = set()
-    fringe.push(Pair(problem.get_start_state(), []), 0)
+    start_node = SearchNode(problem.get_start_state())
+    # state key -> (priority, node) of the best node of the state in the
+    # fringe
+    open_index = {start_node.state.get_state_key(): (0, start_node)}
+    fringe.push(start_node, 0)
     while not fringe.is_empty():
-        state, actions = fringe.pop().unpack()
+        node = fringe.pop()
+        state = node.state
+        state_key = state.get_state_key()
+        open_entry = open_index.get(state_key)
+        if open_entry is None or open_entry[1] is not node:
+            # replaced by a better node of the same state
+            continue
         if problem.is_goal_state(state):
-            return actions
-        if state not in visited:
-            visited.add(state)
-            for successor, action, step_cost in problem.get_successors(state):
-                if successor not in visited:
-                    fringe.push(Pair(successor, actions + [action]),
-                                problem.get_cost_of_actions(
-                                    actions + [action]))
+            return problem.get_moves_of_actions(node.get_actions())
+        if budget is not None and \
+                budget.is_exhausted(problem.expanded, node.cost):
+            return budget.get_partial_result(len(fringe))
+        del open_index[state_key]
+        visited.add(state_key)
+        if stats is not None:
+            stats.record_frontier(len(fringe), len(visited))
+        for successor, action, step_cost in problem.get_successors(state):
+            successor_key = successor.get_state_key()
+            if successor_key in visited:
+                if stats is not None:
+                    stats.record_duplicate()
+                continue
+            cost = node.cost + step_cost
+            priority = evaluation(successor, cost)
+            open_entry = open_index.get(successor_key)
+            if open_entry is not None:
+                # one of the two nodes is pruned
+                if stats is not None:
+                    stats.record_duplicate()
+                if (open_entry[0], -open_entry[1].cost) < (priority, -cost):
+                    continue
+                # on a tie the new node still replaces the indexed one and
+                # the fringe keeps both entries: the fringes pop the last
+                # pushed of equal nodes first, so without the index the new
+                # node is the one expanded, and replacing it keeps the
+                # expanded nodes and the found paths the same
+            successor_node = SearchNode(successor, node, action, cost)
+            open_index[successor_key] = (priority, successor_node)
+            fringe.push(successor_node, priority)
     return []
 
 
@@ -77,29 +218,217 @@ def null_heuristic(state):
     return 0
 
 # A* search
-def a_star_search(problem, heuristic=null_heuristic):
+def a_star_search(problem, heuristic=null_heuristic, fringe=None,
+                  budget=None):
     """
     run the A* search algorithm on the given problem.
     :param problem: the problem to solve.
     :param heuristic: the heuristic function to use.
-    :return: a list of actions that reaches the goal state.
+    :param fringe: priority queue to use, by default a bucket priority queue
+    that breaks ties toward the deeper node (the lower heuristic).
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
     """
-    fringe = PriorityQueue()
-    visited = set()
-    fringe.push(Pair(problem.get_start_state(), []), 0)
+    return weighted_a_star_search(problem, heuristic, 1, fringe, budget)
+
+
+# Weighted A* search
+def weighted_a_star_search(problem, heuristic=null_heuristic,
+                           weight=DEFAULT_WEIGHT, fringe=None, budget=None):
+    """
+    run the weighted A* search algorithm on the given problem, which orders
+    the nodes by f = g + weight * h. a weight above 1 trusts the heuristic
+    more, and finds a solution with fewer expansions.
+    :param problem: the problem to solve.
+    :param heuristic: the heuristic function to use.
+    :param weight: the weight of the heuristic.
+    :param fringe: priority queue to use, by default a bucket priority queue
+    that breaks ties toward the deeper node (the lower heuristic).
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out.
+    """
+    if fringe is None:
+        fringe = BucketPriorityQueue(prefer_deeper_nodes)
+    if problem.stats is not None:
+        heuristic = problem.stats.time_heuristic(heuristic)
+    return best_first_search(
+        problem, fringe,
+        lambda state, cost: cost + weight * heuristic(state), budget)
+
+
+# Anytime weighted A* search
+def anytime_weighted_a_star_search(problem, heuristic=null_heuristic,
+                                   weight=DEFAULT_WEIGHT, fringe=None,
+                                   time_limit=ANYTIME_TIME_LIMIT,
+                                   budget=None, on_solution=None):
+    """
+    run the anytime weighted A* search algorithm on the given problem. the
+    search runs like weighted A*, and when given a time limit goes on after
+    the first solution to look for cheaper ones, until the time limit, the
+    budget or until no node is left. every solution fills all the cells, so
+    a cheaper solution is only one with fewer actions, the chains of forced
+    moves that are played as one step, and not a shorter path.
+    a state is searched again when it is reached by a cheaper path, and the
+    nodes that are not cheaper than the best solution are dropped.
+    :param problem: the problem to solve.
+    :param heuristic: the heuristic function to use.
+    :param weight: the weight of the heuristic.
+    :param fringe: priority queue to use, by default a bucket priority queue
+    that breaks ties toward the deeper node (the lower heuristic).
+    :param time_limit: seconds to look for cheaper solutions after the
+    first one, 0 returns the first solution as soon as it is found. None
+    searches until no node is left or the budget runs out.
+    :param budget: budget of the search, None for no limit. once it runs out
+    the best solution found is returned.
+    :param on_solution: function called with the moves of every solution
+    as soon as it is found, the first one and then every cheaper one, None
+    to not report them.
+    :return: a list of actions that reaches the goal state, the cheapest
+    one found, or a partial result if the budget ran out before the first
+    solution.
+    """
+    deadline = None
+    stats = problem.stats
+    if stats is not None:
+        heuristic = stats.time_heuristic(heuristic)
+    if fringe is None:
+        fringe = BucketPriorityQueue(prefer_deeper_nodes)
+    start_state = problem.get_start_state()
+    best_costs = {start_state.get_state_key(): 0}
+    best_node = None
+    fringe.push(SearchNode(start_state), 0)
     while not fringe.is_empty():
-        state, actions = fringe.pop().unpack()
+        if best_node is not None and deadline is not None and \
+                time.perf_counter() > deadline:
+            break
+        node = fringe.pop()
+        state = node.state
+        if best_node is not None and node.cost >= best_node.cost:
+            continue
         if problem.is_goal_state(state):
-            return actions
-        if state not in visited:
-            visited.add(state)
-            for successor, action, step_cost in problem.get_successors(state):
-                if successor not in visited:
-                    cost = problem.get_cost_of_actions(
-                        actions + [action]) + heuristic(successor)
-                    fringe.push(Pair(successor, actions + [action]), cost)
-    return []
+            best_node = node
+            if on_solution is not None:
+                on_solution(problem.get_moves_of_actions(node.get_actions()))
+            if time_limit is not None:
+                if time_limit <= 0:
+                    break
+                if deadline is None:
+                    deadline = time.perf_counter() + time_limit
+            continue
+        if node.cost > best_costs[state.get_state_key()]:
+            # the state was reached again by a cheaper path
+            continue
+        if budget is not None and \
+                budget.is_exhausted(problem.expanded, node.cost):
+            break
+        if stats is not None:
+            stats.record_frontier(len(fringe), len(best_costs))
+        for successor, action, step_cost in problem.get_successors(state):
+            cost = node.cost + step_cost
+            successor_key = successor.get_state_key()
+            if cost < best_costs.get(successor_key, cost + 1):
+                best_costs[successor_key] = cost
+                fringe.push(SearchNode(successor, node, action, cost),
+                            cost + weight * heuristic(successor))
+            elif stats is not None:
+                stats.record_duplicate()
+    if best_node is None:
+        if budget is not None and budget.exhausted_reason is not None:
+            return budget.get_partial_result(len(fringe))
+        return []
+    return problem.get_moves_of_actions(best_node.get_actions())
 
 
+# IDA* search
+def iterative_deepening_a_star_search(problem, heuristic=null_heuristic,
+                                      table_size=TRANSPOSITION_TABLE_SIZE,
+                                      budget=None):
+    """
+    run the iterative deepening A* search algorithm on the given problem.
+    the moves are made in place on a single board, and the states already
+    searched in the current iteration are kept in a transposition table of
+    a fixed size, so the memory does not grow with the running time.
+    :param problem: the problem to solve.
+    :param heuristic: the heuristic function to use.
+    :param table_size: the number of entries of the transposition table.
+    :param budget: budget of the search, None for no limit.
+    :return: a list of actions that reaches the goal state, or a partial
+    result if the budget ran out. the frontier size of the partial result is
+    the length of the current path.
+    """
+    if problem.stats is not None:
+        heuristic = problem.stats.time_heuristic(heuristic)
+    state = problem.get_start_state().__copy__()
+    table = TranspositionTable(table_size)
+    actions = []
+    bound = heuristic(state)
+    while bound != float('inf'):
+        table.clear()
+        bound = bounded_depth_first_search(problem, heuristic, state, 0,
+                                           bound, table, actions, budget)
+        if bound is None:
+            return problem.get_moves_of_actions(actions)
+        if budget is not None and budget.exhausted_reason is not None:
+            return budget.get_partial_result(len(actions))
+    return []
 
 
+def bounded_depth_first_search(problem, heuristic, state, cost, bound, table,
+                               actions, budget=None):
+    """
+    one iteration of IDA*: depth first search of the states whose f value is
+    within the bound.
+    :param problem: the problem to solve.
+    :param heuristic: the heuristic function to use.
+    :param state: the board to search from, the moves are made on it in place.
+    :param cost: the cost of the path to the state.
+    :param bound: the maximal f value to search.
+    :param table: transposition table of the lowest cost each state was
+    searched with in this iteration.
+    :param actions: the actions of the path to the state, the actions that
+    reach the goal state when one is found.
+    :param budget: budget of the search, None for no limit. once it runs out
+    the search returns without searching further, and without taking back
+    the actions of the path.
+    :return: None if a goal state was found, otherwise the lowest f value that
+    exceeded the bound.
+    """
+    if problem.is_goal_state(state):
+        return None
+    f_value = cost + heuristic(state)
+    if f_value > bound:
+        return f_value
+    state_key = state.get_state_key()
+    searched_cost = table.get(state_key)
+    if searched_cost is not None and searched_cost <= cost:
+        if problem.stats is not None:
+            problem.stats.record_duplicate()
+        return float('inf')
+    if budget is not None and budget.is_exhausted(problem.expanded, cost):
+        return float('inf')
+    table.store(state_key, cost)
+    if problem.stats is not None:
+        problem.stats.record_frontier(len(actions), len(table))
+    next_bound = float('inf')
+    legal_moves = problem.get_actions(state)
+    is_forced = len(legal_moves) == 1
+    for move in legal_moves:
+        action = problem.apply_action(state, move, is_forced)
+        if action is None:
+            continue
+        actions.append(action)
+        result = bounded_depth_first_search(problem, heuristic, state,
+                                            cost + 1, bound, table, actions,
+                                            budget)
+        if result is None:
+            return None
+        if budget is not None and budget.exhausted_reason is not None:
+            # the path is kept, its length is the frontier size of the
+            # partial result
+            return float('inf')
+        actions.pop()
+        problem.undo_action(state, action)
+        next_bound = min(next_bound, result)
+    return next_bound
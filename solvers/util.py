@@ -52,25 +52,38 @@ class LinkedList:
         return self.tail
 
 
-class Pair:
+class SearchNode:
     """
-    A class to represent a pair of state and actions.
+    A class to represent a node of the search tree: a state, the node it was
+    reached from, the action that reached it and the cost of the path to it.
     """
-    def __init__(self, state, actions):
+    __slots__ = ('state', 'parent', 'action', 'cost')
+
+    def __init__(self, state, parent=None, action=None, cost=0):
         """
-        Constructor for the Pair class.
-        :param state:
-        :param actions:
+        Constructor for the SearchNode class.
+        :param state: the state of the node
+        :param parent: the node this node was reached from, None for the root
+        :param action: the action that reached this node from its parent
+        :param cost: the cost of the path from the root to this node
         """
         self.state = state
-        self.actions = actions
+        self.parent = parent
+        self.action = action
+        self.cost = cost
 
-    def unpack(self):
-        """
-        Unpack the pair.
-        :return: state, actions
-        """
-        return self.state, self.actions
+    def get_actions(self):
+        """
+        Rebuild the actions of the path from the root to this node.
+        :return: list of the actions from the root to this node
+        """
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return actions
 
 
 class Stack:
@@ -105,6 +118,13 @@ class Stack:
         """
         return len(self.list) == 0
 
+    def __len__(self):
+        """
+        Get the number of items in the stack.
+        :return: the number of items in the stack
+        """
+        return len(self.list)
+
 
 class Queue:
     """
@@ -137,6 +157,13 @@ class Queue:
         """
         return len(self.list) == 0
 
+    def __len__(self):
+        """
+        Get the number of items in the queue.
+        :return: the number of items in the queue
+        """
+        return len(self.list)
+
 
 class PriorityQueue:
     """
@@ -180,4 +207,56 @@ class PriorityQueue:
         """
         return len(self.heap) == 0
 
+    def __len__(self):
+        """
+        Get the number of items in the priority queue.
+        :return: the number of items in the priority queue
+        """
+        return len(self.heap)
+
+
+class TranspositionTable:
+    """
+    Class to represent a transposition table with a fixed number of entries.
+    When the table is full, storing a new key replaces the oldest entry.
+    """
 
+    def __init__(self, capacity):
+        """
+        Constructor for the TranspositionTable class.
+        :param capacity: the maximal number of entries in the table
+        """
+        self.capacity = capacity
+        self.entries = {}
+
+    def get(self, key):
+        """
+        Get the value stored for the given key.
+        :param key: the key to look up
+        :return: the stored value, or None if the key is not in the table
+        """
+        return self.entries.get(key)
+
+    def store(self, key, value):
+        """
+        Store a value for the given key, replacing the oldest entry if the
+        table is full.
+        :param key: the key to store
+        :param value: the value to store
+        """
+        if key not in self.entries and len(self.entries) >= self.capacity:
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = value
+
+    def clear(self):
+        """
+        Remove all the entries of the table.
+        """
+        self.entries.clear()
+
+    def __len__(self):
+        """
+        Get the number of entries in the table.
+        :return: the number of entries in the table
+        """
+        return len(self.entries)